@@ -1,228 +1,603 @@
-from flask import Flask, render_template, render_template_string, request, jsonify, redirect, url_for, abort
+from flask import Flask, Response, current_app, render_template, request, jsonify, redirect, url_for, abort, send_file, stream_template, stream_with_context
 import csv
+import hashlib
+import io
+import mmap
 import os
 import json
 import atexit
+import queue
+import secrets
+import threading
+import time
+import traceback
+from sys import intern
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
 from datetime import datetime, timedelta
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
-from shared_data import shared_data
-from background_worker import get_worker, start_worker, stop_worker
+from shared_data import shared_data, read_json_lines, append_json_line, tracks_journal_lock
+from background_worker import get_worker, start_worker, stop_worker, wake_worker, forget_cached_lookup
+from async_musicbrainz import MusicBrainzError, RateLimitedMusicBrainz
+from rate_limiter import AdaptiveRateLimiter
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the standard library json module
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # Optional: responses are sent uncompressed
+    Compress = None
 
 # Load environment variables from .env file
 load_dotenv()
 
 app = Flask(__name__)
 
+# Skip the per-render template mtime check unless explicitly asked for (e.g. while editing templates)
+app.config['TEMPLATES_AUTO_RELOAD'] = os.getenv('TEMPLATES_AUTO_RELOAD') == '1'
+
+# Let a front-end server (nginx, Apache) stream static files with sendfile when it supports X-Sendfile
+app.config['USE_X_SENDFILE'] = os.getenv('USE_X_SENDFILE') == '1'
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (same output options as the default provider)"""
+    
+    def _dumps_bytes(self, obj, indent=False, sort_keys=None, option=0):
+        option |= orjson.OPT_NON_STR_KEYS
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+    
+    def dumps(self, obj, **kwargs):
+        return self._dumps_bytes(obj, kwargs.get('indent'), kwargs.get('sort_keys')).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of decoding and re-encoding a str.
+        # Arguments are handled as jsonify() documents: one value, several as a list, or keywords as a dict
+        if args and kwargs:
+            raise TypeError("app.json.response() takes either args or kwargs, not both")
+        if kwargs:
+            obj = kwargs
+        elif len(args) == 1:
+            obj = args[0]
+        else:
+            obj = list(args) or None
+        indent = (self.compact is None and current_app.debug) or self.compact is False
+        body = self._dumps_bytes(obj, indent, option=orjson.OPT_APPEND_NEWLINE)
+        return current_app.response_class(body, mimetype=self.mimetype)
+
+# Serialize jsonify() responses and parse request bodies with orjson when it is installed
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Compress JSON/HTML/JS/CSS responses when flask-compress is installed
+if Compress is not None:
+    app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html', 'text/css',
+                                        'text/javascript', 'application/javascript']
+    app.config['COMPRESS_LEVEL'] = 6
+    Compress(app)
+
 CATALOG_FILE = 'catalog.csv'
 CONFIG_FILE = 'csv_fields.json'
 TRACKS_CACHE_FILE = 'barcode_tracks.json'
 STARRED_FILE = 'starred.csv'
 STARRED_ALBUMS_FILE = 'starred_albums.csv'
 
-# Start background worker on app startup (lazy initialization)
-def startup():
-    try:
-        start_worker()
-        print("Asynchronous barcode processing started")
-    except Exception as e:
-        print(f"Failed to start background worker: {e}")
-        print("Worker will be started on first request")
+# Rendered once on first request - the scanner page has no per-request data
+_admin_index_html = None
 
-# Register startup function
-with app.app_context():
-    startup()
+# Read buffer for the CSV loaders (larger than the 8 KiB default to cut read() syscalls)
+CSV_READ_BUFFER = 256 * 1024
 
-# Graceful shutdown
-def shutdown():
-    print("Shutting down background worker...")
-    stop_worker()
+# Number of catalog rows serialized per chunk when streaming /api/catalog
+CATALOG_STREAM_BATCH = 500
 
-atexit.register(shutdown)
+# Streamed HTML is sent in chunks of about this many characters rather than one per template fragment
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Mixed into every ETag so version counters that restart with the process never collide
+_ETAG_SALT = os.urandom(8).hex()
+
+# In-memory copies of the starred files, reloaded only when the file on disk changes.
+# 'version' is bumped on every reload or mutation so derived data can be cached against it.
+_STARRED_TRACKS_CACHE = {'stamp': None, 'data': None, 'version': 0, 'checked': 0.0}
+_STARRED_ALBUMS_CACHE = {'stamp': None, 'data': None, 'version': 0, 'checked': 0.0}
+
+# This process makes every star/unstar itself, so the files only need re-checking for outside edits;
+# doing that at most once a second keeps a stat() off each of the several lookups per request
+STARRED_RECHECK_SECONDS = 1.0
+_starred_lock = threading.RLock()
+
+# Star/unstar actions are appended to the starred files as journal rows ('+' / '-')
+# and each file is compacted back to a plain snapshot every STARRED_COMPACT_INTERVAL appends to it
+STARRED_COMPACT_INTERVAL = 500
+_starred_appends = {}
+
+# Journal rows are handed to a single writer thread, which coalesces bursts into one append.
+# The window is wide enough to catch someone clicking through an album's tracks; shutdown
+# (registered with atexit) waits for anything still queued.
+STARRED_WRITE_COALESCE_SECONDS = 0.5
+_starred_write_queue = queue.Queue()
+_starred_writer_thread = None
+
+# Parsed catalog.csv, rebuilt only when the file's (mtime, size) stamp changes
+_CATALOG_CSV_CACHE = {'stamp': None, 'rows': [], 'by_barcode': {}, 'barcodes': set()}
+
+# In-memory copy of the track listings cache, reloaded only when the file on disk changes
+_TRACKS_CACHE = {'stamp': None, 'data': None}
+_tracks_lock = threading.RLock()
+
+# barcode_tracks.json is a journal of JSON lines (the worker compacts it). Newly fetched listings are
+# appended by a background thread TRACKS_WRITE_DELAY seconds after the first unsaved one, so a burst
+# of album views costs one append
+TRACKS_WRITE_DELAY = 1.0
+_tracks_pending = {}
+_tracks_dirty = threading.Event()
+_tracks_writer_thread = None
+
+# MusicBrainz client for album views when the background worker can't be started, created on first use
+_fallback_mb_client = None
+_fallback_mb_client_lock = threading.Lock()
+
+def read_json_file(path):
+    """Read a JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        # orjson parses straight out of the mapped file, with no intermediate bytes copy
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return orjson.loads(view)
+            finally:
+                view.release()  # The map can't close while a view of it is alive
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def dumps_json(data):
+    """Serialize data to a compact JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+def write_json_file(path, data, indent=True):
+    """Atomically write a JSON file (2-space indent, or compact), using orjson when it is installed"""
+    # Write to a temp file and swap it in so readers never see a partial file. The name is unique
+    # to this thread, so concurrent writes to one path can't swap in each other's half-written file
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=option))
+                f.flush()
+                os.fsync(f.fileno())
+        else:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                if indent:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                else:
+                    json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _load_catalog_csv():
+    """Parse catalog.csv once per change into rows, a barcode index and a barcode set"""
+    cache = _CATALOG_CSV_CACHE
+    stamp = _file_stamp(CATALOG_FILE)
+    if cache['stamp'] == stamp:
+        return cache
+    
+    rows = []
+    by_barcode = {}
+    if stamp is not None and stamp[1] > 0:
+        # Map the file and decode it in one go rather than pulling it through a buffered reader
+        with open(CATALOG_FILE, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = mm[:].decode('utf-8-sig')
+        # Plain csv.reader plus one zip per row is much cheaper than DictReader's per-row bookkeeping
+        reader = csv.reader(io.StringIO(text, newline=''))
+        header = next(reader, None) or []
+        idx = header.index('Barcode') if 'Barcode' in header else None
+        for values in reader:
+            if not values:
+                continue
+            row = dict(zip(header, values))
+            rows.append(row)
+            if idx is not None and idx < len(values) and values[idx]:
+                by_barcode.setdefault(values[idx], row)
+    
+    cache = {'stamp': stamp, 'rows': rows, 'by_barcode': by_barcode, 'barcodes': set(by_barcode)}
+    _CATALOG_CSV_CACHE.update(cache)
+    return cache
 
 def load_existing_barcodes():
     """Load existing barcodes from catalog to prevent duplicates"""
-    existing_barcodes = set()
-    if os.path.exists(CATALOG_FILE):
-        with open(CATALOG_FILE, newline='', encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                barcode = row.get("Barcode")
-                if barcode:
-                    existing_barcodes.add(barcode)
-    return existing_barcodes
+    return _load_catalog_csv()['barcodes']
 
 def load_catalog():
     """Load the entire catalog for display"""
-    catalog = []
-    if os.path.exists(CATALOG_FILE):
-        with open(CATALOG_FILE, newline='', encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                catalog.append(row)
-    return catalog
+    return _load_catalog_csv()['rows']
+
+def find_catalog_album(barcode):
+    """Look up an album by barcode, falling back to catalog.csv for rows the worker has not published yet"""
+    return shared_data.get_catalog_item(barcode) or _load_catalog_csv()['by_barcode'].get(barcode)
 
 def load_tracks_cache():
-    """Load track listings cache from disk"""
-    if os.path.exists(TRACKS_CACHE_FILE):
-        try:
-            with open(TRACKS_CACHE_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return {}
-    return {}
-
-def save_tracks_cache(cache):
-    """Save track listings cache to disk"""
-    try:
-        with open(TRACKS_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(cache, f, indent=2, ensure_ascii=False)
-    except IOError as e:
-        print(f"Error saving tracks cache: {e}")
+    """Load track listings cache from disk (cached until the file changes)"""
+    cache = _TRACKS_CACHE
+    stamp = _file_stamp(TRACKS_CACHE_FILE)
+    if cache['data'] is not None and cache['stamp'] == stamp:
+        return cache['data']
+    
+    with _tracks_lock:
+        # Another request may have reloaded (or saved) the cache while we waited
+        stamp = _file_stamp(TRACKS_CACHE_FILE)
+        if cache['data'] is not None and cache['stamp'] == stamp:
+            return cache['data']
+        
+        tracks_cache = {}
+        if stamp is not None:
+            try:
+                tracks_cache = read_json_lines(TRACKS_CACHE_FILE, loads=orjson.loads if orjson is not None else json.loads)
+            except (ValueError, IOError):
+                tracks_cache = {}
+        # Keep listings fetched here that have not been written back yet
+        tracks_cache.update(_tracks_pending)
+        cache['data'] = tracks_cache
+        cache['stamp'] = stamp
+    return tracks_cache
+
+def _tracks_writer_loop():
+    """Write back pending track listings, one rewrite per burst of changes"""
+    while True:
+        _tracks_dirty.wait()
+        time.sleep(TRACKS_WRITE_DELAY)
+        _tracks_dirty.clear()
+        flush_tracks_cache()
+
+def flush_tracks_cache():
+    """Write any pending track listings to disk now"""
+    with _tracks_lock:
+        if not _tracks_pending:
+            return
+        # The worker compacts this file under tracks_journal_lock; appending under it too keeps
+        # a compaction from replacing the file while this write goes in
+        with tracks_journal_lock:
+            before = _file_stamp(TRACKS_CACHE_FILE)
+            try:
+                # One journal line for the whole batch
+                append_json_line(TRACKS_CACHE_FILE, _tracks_pending, dumps=orjson.dumps if orjson is not None else None)
+            except IOError as e:
+                print(f"Error saving tracks cache: {e}")
+                return
+            after = _file_stamp(TRACKS_CACHE_FILE)
+        _tracks_pending.clear()
+        # Our in-memory copy already has these; only reload later if someone else changed the file too
+        if _TRACKS_CACHE['stamp'] == before:
+            _TRACKS_CACHE['stamp'] = after
+
+def _queue_tracks_save(barcode, tracks):
+    """Record a fetched track listing in memory and schedule it to be written back"""
+    global _tracks_writer_thread
+    with _tracks_lock:
+        load_tracks_cache()[barcode] = tracks
+        _tracks_pending[barcode] = tracks
+        if _tracks_writer_thread is None:
+            _tracks_writer_thread = threading.Thread(target=_tracks_writer_loop, daemon=True)
+            _tracks_writer_thread.start()
+    _tracks_dirty.set()
 
 def get_tracks(barcode, mbid):
     """Get track listing from cache or fetch from MusicBrainz if not cached"""
-    cache = load_tracks_cache()
+    # Listings never change once fetched, so a hit is served from memory without touching the disk
+    cache = _TRACKS_CACHE['data']
+    if cache is not None and barcode in cache:
+        return cache[barcode]
     
-    # Check if tracks are cached for this barcode
+    # Only a miss checks the file, in case the worker has cached this album since we last loaded it
+    cache = load_tracks_cache()
     if barcode in cache:
         return cache[barcode]
     
-    # Fetch tracks from MusicBrainz
+    # Fetch tracks from MusicBrainz through a rate-limited client rather than calling the API unthrottled
     tracks = []
     if mbid:
-        from musicbrainz_barcode_lookup import get_track_names
-        tracks = get_track_names(mbid) or []
+        try:
+            mb_client = _get_mb_client()
+        except Exception as e:
+            # Not even a fallback client could be created; render the page without tracks
+            print(f"No MusicBrainz client for tracks of {barcode}: {e}")
+            return tracks
+        try:
+            tracks = mb_client.get_track_names(mbid) or []
+        except MusicBrainzError as e:
+            print(f"Error fetching tracks for {barcode}: {e}")
+            return tracks
         
-        # Cache the result
-        cache[barcode] = tracks
-        save_tracks_cache(cache)
+        # Cache the result in memory now and on disk shortly after
+        _queue_tracks_save(barcode, tracks)
     
     return tracks
 
-def remove_from_no_coverart_csv(barcode_to_remove):
-    """Remove a barcode from the no_coverart.csv file"""
-    no_coverart_file = 'no_coverart.csv'
-    
-    if not os.path.exists(no_coverart_file):
-        return
-    
+def _get_mb_client():
+    """The worker's MusicBrainz client (sharing its rate limiter and backoff), or Flask's own if the worker can't start"""
+    global _fallback_mb_client
     try:
-        # Read all entries
-        entries = []
-        with open(no_coverart_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get('Barcode') != barcode_to_remove:
-                    entries.append(row)
-        
-        # Write back without the removed entry
-        with open(no_coverart_file, 'w', newline='', encoding='utf-8') as f:
-            if entries:
-                writer = csv.DictWriter(f, fieldnames=['Barcode', 'Artist', 'Album'])
-                writer.writeheader()
-                writer.writerows(entries)
-            else:
-                # If no entries left, just write header
-                writer = csv.writer(f)
-                writer.writerow(['Barcode', 'Artist', 'Album'])
-        
-        print(f"Removed {barcode_to_remove} from no_coverart.csv")
+        return get_worker().mb_client
     except Exception as e:
-        print(f"Error removing {barcode_to_remove} from no_coverart.csv: {e}")
+        print(f"Worker unavailable for MusicBrainz lookups, using Flask's own client: {e}")
+    with _fallback_mb_client_lock:
+        if _fallback_mb_client is None:
+            _fallback_mb_client = RateLimitedMusicBrainz(AdaptiveRateLimiter())
+        return _fallback_mb_client
 
-def update_no_coverart_cache():
-    """Update the shared data no cover art cache"""
+def _file_stamp(path):
+    """Return (mtime_ns, size) for a file, or None if it does not exist"""
     try:
-        no_coverart_file = 'no_coverart.csv'
-        no_coverart_data = []
-        
-        if os.path.exists(no_coverart_file):
-            with open(no_coverart_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                no_coverart_data = list(reader)
-        
-        shared_data.update_no_coverart_cache(no_coverart_data)
-        print("Updated no cover art cache")
-    except Exception as e:
-        print(f"Error updating no cover art cache: {e}")
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _starred_cache_fresh(cache, path):
+    """Check whether cached starred data can be used without re-reading its file"""
+    if cache['data'] is None:
+        return False
+    now = time.monotonic()
+    if now - cache['checked'] < STARRED_RECHECK_SECONDS:
+        return True
+    if cache['stamp'] == _file_stamp(path):
+        cache['checked'] = now
+        return True
+    return False
 
 def load_starred_tracks():
-    """Load starred tracks from CSV file"""
-    starred_tracks = {}
-    if os.path.exists(STARRED_FILE):
-        try:
-            with open(STARRED_FILE, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    barcode = row.get('Barcode')
-                    track_number = row.get('Track')
-                    if barcode and track_number:
-                        if barcode not in starred_tracks:
-                            starred_tracks[barcode] = set()
-                        starred_tracks[barcode].add(track_number)
-        except Exception as e:
-            print(f"Error loading starred tracks: {e}")
+    """Load starred tracks from CSV journal (cached until the file changes)"""
+    cache = _STARRED_TRACKS_CACHE
+    if _starred_cache_fresh(cache, STARRED_FILE):
+        return cache['data']
+    
+    with _starred_lock:
+        # Another thread may have reloaded (or the writer appended) while we waited
+        if _starred_cache_fresh(cache, STARRED_FILE):
+            return cache['data']
+        stamp = _file_stamp(STARRED_FILE)
+        
+        starred = defaultdict(set)
+        if stamp is not None:
+            try:
+                with open(STARRED_FILE, 'r', newline='', encoding='utf-8', buffering=CSV_READ_BUFFER) as f:
+                    reader = csv.reader(f)
+                    next(reader, None)  # Skip header
+                    # Fold the journal left-to-right; rows without an op are stars
+                    for row in reader:
+                        if len(row) < 2 or not row[0] or not row[1]:
+                            continue
+                        if len(row) > 2 and row[2] == '-':
+                            track_numbers = starred.get(row[0])
+                            if track_numbers:
+                                track_numbers.discard(row[1])
+                                if not track_numbers:
+                                    del starred[row[0]]
+                        else:
+                            # Track numbers repeat across every album, so share one string per number
+                            starred[row[0]].add(intern(row[1]))
+            except Exception as e:
+                print(f"Error loading starred tracks: {e}")
+        starred_tracks = dict(starred)
+        cache['data'] = starred_tracks
+        cache['stamp'] = stamp
+        cache['checked'] = time.monotonic()
+        cache['version'] += 1
     return starred_tracks
 
+def _csv_payload(header, rows):
+    """Encode CSV rows as one bytes payload, skipping the csv module when no field needs quoting"""
+    rows = list(rows)
+    fields = '\x00'.join(map('\x00'.join, rows))
+    if ',' in fields or '"' in fields or '\n' in fields or '\r' in fields:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(header)
+        writer.writerows(rows)
+        return buffer.getvalue().encode('utf-8')
+    lines = [','.join(header)]
+    lines.extend(map(','.join, rows))
+    lines.append('')
+    return '\n'.join(lines).encode('utf-8')
+
 def save_starred_tracks(starred_tracks):
-    """Save starred tracks to CSV file"""
+    """Save starred tracks to CSV file as a compacted snapshot"""
     try:
-        with open(STARRED_FILE, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Barcode', 'Track'])
-            for barcode, track_numbers in starred_tracks.items():
-                for track_number in track_numbers:
-                    writer.writerow([barcode, track_number])
-        print(f"Saved {sum(len(track_numbers) for track_numbers in starred_tracks.values())} starred tracks")
+        with _starred_lock:
+            tmp_file = STARRED_FILE + '.tmp'
+            rows = [(barcode, track_number)
+                    for barcode, track_numbers in starred_tracks.items()
+                    for track_number in track_numbers]
+            count = len(rows)
+            with open(tmp_file, 'wb') as f:
+                f.write(_csv_payload(['Barcode', 'Track'], rows))
+            os.replace(tmp_file, STARRED_FILE)
+            _STARRED_TRACKS_CACHE['data'] = starred_tracks
+            _STARRED_TRACKS_CACHE['stamp'] = _file_stamp(STARRED_FILE)
+            _STARRED_TRACKS_CACHE['version'] += 1
+        print(f"Saved {count} starred tracks")
     except Exception as e:
         print(f"Error saving starred tracks: {e}")
 
+def _append_starred_rows(path, header, rows, cache):
+    """Append journal rows to a starred file, compacting periodically"""
+    with _starred_lock:
+        write_header = not os.path.exists(path)
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(header)
+            writer.writerows(rows)
+        # The in-memory data was already updated by the caller
+        cache['stamp'] = _file_stamp(path)
+        
+        _starred_appends[path] = _starred_appends.get(path, 0) + len(rows)
+        if _starred_appends[path] >= STARRED_COMPACT_INTERVAL:
+            _compact_starred_file(path)
+
+def _starred_writer_loop():
+    """Drain queued journal rows, coalescing bursts into a single append per file"""
+    while True:
+        batch = [_starred_write_queue.get()]
+        deadline = time.monotonic() + STARRED_WRITE_COALESCE_SECONDS
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_starred_write_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        
+        # Group rows by file, preserving the order they were queued in
+        grouped = {}
+        for path, header, row, cache in batch:
+            grouped.setdefault(path, (header, cache, []))[2].append(row)
+        try:
+            for path, (header, cache, rows) in grouped.items():
+                _append_starred_rows(path, header, rows, cache)
+        except Exception as e:
+            print(f"Error writing starred journal: {e}")
+        finally:
+            for _ in batch:
+                _starred_write_queue.task_done()
+
+def _queue_starred_row(path, header, row, cache):
+    """Queue a journal row for the background writer (starting it if needed)"""
+    global _starred_writer_thread
+    with _starred_lock:
+        if _starred_writer_thread is None:
+            _starred_writer_thread = threading.Thread(target=_starred_writer_loop, daemon=True)
+            _starred_writer_thread.start()
+    _starred_write_queue.put((path, header, row, cache))
+
+def flush_starred_writes(timeout=5.0):
+    """Wait for queued journal rows to reach disk"""
+    deadline = time.monotonic() + timeout
+    while _starred_write_queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def _compact_starred_file(path):
+    """Rewrite one starred journal as a plain snapshot, dropping unstar tombstones"""
+    with _starred_lock:
+        if os.path.exists(path):
+            if path == STARRED_ALBUMS_FILE:
+                save_starred_albums(load_starred_albums())
+            else:
+                save_starred_tracks(load_starred_tracks())
+        _starred_appends[path] = 0
+
+def compact_starred():
+    """Rewrite both starred journals as plain snapshots"""
+    _compact_starred_file(STARRED_FILE)
+    _compact_starred_file(STARRED_ALBUMS_FILE)
+
 def is_track_starred(barcode, track_number):
     """Check if a track is starred"""
-    starred_tracks = load_starred_tracks()
-    return barcode in starred_tracks and str(track_number) in starred_tracks[barcode]
+    return str(track_number) in load_starred_tracks().get(barcode, ())
 
 def star_track(barcode, track_number):
     """Star a track"""
-    starred_tracks = load_starred_tracks()
-    if barcode not in starred_tracks:
-        starred_tracks[barcode] = set()
-    starred_tracks[barcode].add(str(track_number))
-    save_starred_tracks(starred_tracks)
+    track_number = intern(str(track_number))
+    with _starred_lock:
+        starred_tracks = load_starred_tracks()
+        track_numbers = starred_tracks.get(barcode, frozenset())
+        if track_number in track_numbers:
+            return
+        # Copy-on-write, so a page iterating the old dict or its sets never sees them change
+        starred_tracks = dict(starred_tracks)
+        starred_tracks[barcode] = track_numbers | {track_number}
+        _STARRED_TRACKS_CACHE['data'] = starred_tracks
+        _STARRED_TRACKS_CACHE['version'] += 1
+        _queue_starred_row(STARRED_FILE, ['Barcode', 'Track'], [barcode, track_number, '+'], _STARRED_TRACKS_CACHE)
 
 def unstar_track(barcode, track_number):
     """Unstar a track"""
-    starred_tracks = load_starred_tracks()
-    if barcode in starred_tracks and str(track_number) in starred_tracks[barcode]:
-        starred_tracks[barcode].remove(str(track_number))
-        if not starred_tracks[barcode]:  # Remove barcode if no tracks left
-            del starred_tracks[barcode]
-        save_starred_tracks(starred_tracks)
+    track_number = str(track_number)
+    with _starred_lock:
+        starred_tracks = load_starred_tracks()
+        if track_number in starred_tracks.get(barcode, ()):
+            # Copy-on-write, as in star_track
+            starred_tracks = dict(starred_tracks)
+            starred_tracks[barcode] = starred_tracks[barcode] - {track_number}
+            if not starred_tracks[barcode]:  # Remove barcode if no tracks left
+                del starred_tracks[barcode]
+            _STARRED_TRACKS_CACHE['data'] = starred_tracks
+            _STARRED_TRACKS_CACHE['version'] += 1
+            _queue_starred_row(STARRED_FILE, ['Barcode', 'Track'], [barcode, track_number, '-'], _STARRED_TRACKS_CACHE)
 
 def load_starred_albums():
-    """Load starred albums from CSV file"""
-    starred_albums = set()
-    if os.path.exists(STARRED_ALBUMS_FILE):
-        try:
-            with open(STARRED_ALBUMS_FILE, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    barcode = row.get('Barcode')
-                    if barcode:
-                        starred_albums.add(barcode)
-        except Exception as e:
-            print(f"Error loading starred albums: {e}")
+    """Load starred albums from CSV journal (cached until the file changes)"""
+    cache = _STARRED_ALBUMS_CACHE
+    if _starred_cache_fresh(cache, STARRED_ALBUMS_FILE):
+        return cache['data']
+    
+    with _starred_lock:
+        # Another thread may have reloaded (or the writer appended) while we waited
+        if _starred_cache_fresh(cache, STARRED_ALBUMS_FILE):
+            return cache['data']
+        stamp = _file_stamp(STARRED_ALBUMS_FILE)
+        
+        starred_albums = set()
+        if stamp is not None:
+            try:
+                with open(STARRED_ALBUMS_FILE, 'r', newline='', encoding='utf-8', buffering=CSV_READ_BUFFER) as f:
+                    reader = csv.reader(f)
+                    next(reader, None)  # Skip header
+                    for row in reader:
+                        if not row or not row[0]:
+                            continue
+                        if len(row) > 1 and row[1] == '-':
+                            starred_albums.discard(row[0])
+                        else:
+                            starred_albums.add(row[0])
+            except Exception as e:
+                print(f"Error loading starred albums: {e}")
+        # Readers get an immutable snapshot; star/unstar swap in a new one
+        starred_albums = frozenset(starred_albums)
+        cache['data'] = starred_albums
+        cache['stamp'] = stamp
+        cache['checked'] = time.monotonic()
+        cache['version'] += 1
     return starred_albums
 
 def save_starred_albums(starred_albums):
-    """Save starred albums to CSV file"""
+    """Save starred albums to CSV file as a compacted snapshot"""
     try:
-        with open(STARRED_ALBUMS_FILE, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Barcode'])
-            for barcode in starred_albums:
-                writer.writerow([barcode])
+        with _starred_lock:
+            tmp_file = STARRED_ALBUMS_FILE + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(_csv_payload(['Barcode'], ((barcode,) for barcode in sorted(starred_albums))))
+            os.replace(tmp_file, STARRED_ALBUMS_FILE)
+            _STARRED_ALBUMS_CACHE['data'] = frozenset(starred_albums)
+            _STARRED_ALBUMS_CACHE['stamp'] = _file_stamp(STARRED_ALBUMS_FILE)
+            _STARRED_ALBUMS_CACHE['version'] += 1
         print(f"Saved {len(starred_albums)} starred albums")
     except Exception as e:
         print(f"Error saving starred albums: {e}")
@@ -234,21 +609,49 @@ def is_album_starred(barcode):
 
 def star_album(barcode):
     """Star an album"""
-    starred_albums = load_starred_albums()
-    starred_albums.add(barcode)
-    save_starred_albums(starred_albums)
+    with _starred_lock:
+        starred_albums = load_starred_albums()
+        if barcode in starred_albums:
+            return
+        # Copy-on-write, so a page rendering from the old snapshot never sees it change mid-iteration
+        _STARRED_ALBUMS_CACHE['data'] = starred_albums | {barcode}
+        _STARRED_ALBUMS_CACHE['version'] += 1
+        _queue_starred_row(STARRED_ALBUMS_FILE, ['Barcode'], [barcode, '+'], _STARRED_ALBUMS_CACHE)
 
 def unstar_album(barcode):
     """Unstar an album"""
-    starred_albums = load_starred_albums()
-    if barcode in starred_albums:
-        starred_albums.remove(barcode)
-        save_starred_albums(starred_albums)
+    with _starred_lock:
+        starred_albums = load_starred_albums()
+        if barcode in starred_albums:
+            _STARRED_ALBUMS_CACHE['data'] = starred_albums - {barcode}
+            _STARRED_ALBUMS_CACHE['version'] += 1
+            _queue_starred_row(STARRED_ALBUMS_FILE, ['Barcode'], [barcode, '-'], _STARRED_ALBUMS_CACHE)
+
+def _enriched_starred_tracks_key():
+    """Refresh the enriched starred tracks' inputs and return their versions"""
+    load_starred_tracks()
+    load_tracks_cache()
+    shared_data.get_coverart_barcodes()
+    return (
+        _STARRED_TRACKS_CACHE['version'],
+        _TRACKS_CACHE['stamp'],
+        shared_data.catalog_version(),
+        shared_data.coverart_version()
+    )
 
 def get_enriched_starred_tracks():
     """Get starred tracks with full album and track information"""
+    # Reuse the last result unless one of the inputs changed
+    return _build_enriched_starred_tracks(_enriched_starred_tracks_key())
+
+@lru_cache(maxsize=1)
+def _build_enriched_starred_tracks(cache_key):
+    """Build the enriched starred tracks list (memoized on the inputs' versions)"""
     starred_tracks = load_starred_tracks()
-    enriched_tracks = []
+    tracks_cache = load_tracks_cache()
+    coverart_barcodes = shared_data.get_coverart_barcodes()
+    # (sort key, entry) pairs, so the key is built once per track and never stored on the entry
+    decorated = []
     
     for barcode, track_numbers in starred_tracks.items():
         # Get album information from catalog
@@ -257,37 +660,141 @@ def get_enriched_starred_tracks():
             continue
             
         # Get track listing for this album
-        mbid = album.get('MusicBrainz ID')
-        tracks = get_tracks(barcode, mbid)
+        tracks = tracks_cache.get(barcode)
+        if tracks is None:
+            tracks = get_tracks(barcode, album.get('MusicBrainz ID'))
         
         # Get cover art URL
-        cover_url = f"/static/coverart/{barcode}.jpg" if os.path.exists(f"static/coverart/{barcode}.jpg") else None
+        cover_url = f"/static/coverart/{barcode}.jpg" if barcode in coverart_barcodes else None
+        
+        # Album-level fields are the same for every starred track on it
+        artist = album.get('Artist', 'Unknown Artist')
+        album_name = album.get('Album/Release', 'Unknown Album')
+        first_release = album.get('First Release')
+        year = first_release.split('-', 1)[0] if first_release else 'Unknown'
+        track_count = len(tracks)
         
         for track_number in track_numbers:
             try:
                 track_index = int(track_number) - 1
-                if 0 <= track_index < len(tracks):
-                    track_name = tracks[track_index]
-                    enriched_tracks.append({
+                if 0 <= track_index < track_count:
+                    entry = {
                         'barcode': barcode,
                         'track_number': track_number,
-                        'track_name': track_name,
-                        'artist': album.get('Artist', 'Unknown Artist'),
-                        'album': album.get('Album/Release', 'Unknown Album'),
+                        'track_name': tracks[track_index],
+                        'artist': artist,
+                        'album': album_name,
                         'cover_url': cover_url,
-                        'year': album.get('First Release', '').split('-')[0] if album.get('First Release') else 'Unknown'
-                    })
+                        'year': year
+                    }
+                    decorated.append(((artist, album_name, track_index), entry))
             except (ValueError, IndexError):
                 continue
     
     # Sort by artist, then album, then track number
-    enriched_tracks.sort(key=lambda x: (x['artist'], x['album'], int(x['track_number'])))
-    return enriched_tracks
+    decorated.sort(key=itemgetter(0))
+    return [entry for _, entry in decorated]
+
+# Set once the startup thread has finished trying to start the worker
+_worker_started = threading.Event()
+
+def _start_worker_in_background():
+    """Start the background worker (run on its own thread by startup)"""
+    try:
+        start_worker()
+        print("Asynchronous barcode processing started")
+    except Exception as e:
+        print(f"Failed to start background worker: {e}")
+        print("Worker will be started on first request")
+    finally:
+        _worker_started.set()
+
+# Start background worker on app startup (lazy initialization)
+def startup():
+    compact_starred()
+    load_starred_tracks()
+    load_starred_albums()
+    load_tracks_cache()
+    shared_data.get_catalog_cache()
+    shared_data.get_coverart_barcodes()
+    # Creating the worker opens the queue database, so do it off the import path
+    threading.Thread(target=_start_worker_in_background, daemon=True).start()
+
+# Register startup function
+with app.app_context():
+    startup()
+
+# Graceful shutdown
+def shutdown():
+    flush_starred_writes()
+    flush_tracks_cache()
+    # Don't race a worker that is still being started
+    _worker_started.wait(timeout=10)
+    print("Shutting down background worker...")
+    stop_worker()
+
+atexit.register(shutdown)
+
+def chunked(fragments, size=STREAM_CHUNK_SIZE):
+    """Group many small streamed fragments into fewer, larger chunks"""
+    buffer = []
+    buffered = 0
+    for fragment in fragments:
+        buffer.append(fragment)
+        buffered += len(fragment)
+        if buffered >= size:
+            yield ''.join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield ''.join(buffer)
+
+def json_array_stream(items):
+    """Serialize a list as a JSON array, CATALOG_STREAM_BATCH items at a time"""
+    yield '['
+    for start in range(0, len(items), CATALOG_STREAM_BATCH):
+        chunk = ','.join(dumps_json(item) for item in items[start:start + CATALOG_STREAM_BATCH])
+        yield chunk if start == 0 else ',' + chunk
+    yield ']'
+
+def make_etag(*parts):
+    """Build an ETag from the versions of the data a response is rendered from"""
+    key = repr((_ETAG_SALT,) + parts).encode('utf-8')
+    return hashlib.blake2b(key, digest_size=8).hexdigest()
+
+def not_modified(etag):
+    """Return a 304 response if the client already holds this ETag, otherwise None"""
+    # Compressed responses carry the tag as "<etag>:<encoding>" (flask-compress), so match either form
+    tags = request.if_none_match
+    if tags.star_tag or any(tag.split(':', 1)[0] == etag for tag in tags.as_set()):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+def album_etag(barcode):
+    """ETag for an album's API payload: its catalog row, tracks, cover art and starred state"""
+    load_starred_tracks()
+    load_starred_albums()
+    load_tracks_cache()
+    shared_data.get_coverart_barcodes()
+    return make_etag(
+        'album',
+        barcode,
+        shared_data.catalog_version(),
+        _TRACKS_CACHE['stamp'],
+        shared_data.coverart_version(),
+        _STARRED_TRACKS_CACHE['version'],
+        _STARRED_ALBUMS_CACHE['version']
+    )
 
 @app.route('/admin')
 def admin_index():
     """Admin barcode scanning page"""
-    return render_template('index.html')
+    global _admin_index_html
+    if _admin_index_html is None or app.config['TEMPLATES_AUTO_RELOAD']:
+        _admin_index_html = render_template('index.html')
+    return _admin_index_html
 
 @app.route('/admin/scan', methods=['POST'])
 def scan_barcode():
@@ -298,20 +805,19 @@ def scan_barcode():
     if not barcode:
         return jsonify({'error': 'No barcode provided'}), 400
     
-    # Check if already in catalog (using shared data)
-    if shared_data.is_barcode_in_catalog(barcode):
+    # Check if already in catalog (using shared data) - one indexed lookup, no catalog walk
+    catalog_item = shared_data.get_catalog_item(barcode)
+    if catalog_item:
         # Return existing catalog data
-        catalog_item = shared_data.get_catalog_item(barcode)
-        if catalog_item:
-            response = {
-                'success': True,
-                'status': 'already_exists',
-                'barcode': barcode,
-                'title': catalog_item.get('Album/Release', 'Unknown Album'),
-                'artist': catalog_item.get('Artist', 'Unknown Artist'),
-                'first_release': catalog_item.get('First Release', 'Unknown')
-            }
-            return jsonify(response)
+        response = {
+            'success': True,
+            'status': 'already_exists',
+            'barcode': barcode,
+            'title': catalog_item.get('Album/Release', 'Unknown Album'),
+            'artist': catalog_item.get('Artist', 'Unknown Artist'),
+            'first_release': catalog_item.get('First Release', 'Unknown')
+        }
+        return jsonify(response)
     
     # Check if already in processing queue (using shared data)
     queue_status = shared_data.get_queue_status(barcode)
@@ -330,6 +836,7 @@ def scan_barcode():
     # Add to pending barcodes for worker to pick up
     success = shared_data.add_pending_barcode(barcode)
     if success:
+        wake_worker()
         # Record scan activity for catalog rebuild tracking
         shared_data.record_scan_activity()
         response = {
@@ -347,17 +854,16 @@ def scan_barcode():
 def barcode_status(barcode):
     """Get current status of a barcode"""
     # Check if in catalog first (using shared data)
-    if shared_data.is_barcode_in_catalog(barcode):
-        catalog_item = shared_data.get_catalog_item(barcode)
-        if catalog_item:
-            return jsonify({
-                'status': 'complete',
-                'barcode': barcode,
-                'title': catalog_item.get('Album/Release', 'Unknown Album'),
-                'artist': catalog_item.get('Artist', 'Unknown Artist'),
-                'first_release': catalog_item.get('First Release', 'Unknown'),
-                'in_catalog': True
-            })
+    catalog_item = shared_data.get_catalog_item(barcode)
+    if catalog_item:
+        return jsonify({
+            'status': 'complete',
+            'barcode': barcode,
+            'title': catalog_item.get('Album/Release', 'Unknown Album'),
+            'artist': catalog_item.get('Artist', 'Unknown Artist'),
+            'first_release': catalog_item.get('First Release', 'Unknown'),
+            'in_catalog': True
+        })
     
     # Check queue status (using shared data)
     queue_status = shared_data.get_queue_status(barcode)
@@ -407,16 +913,25 @@ def queue_stats_api():
 @app.route('/admin/queue/failed')
 def failed_barcodes():
     """Get failed barcodes for retry"""
-    # Get all queue items and filter for failed ones
-    all_queue = shared_data.get_queue_status()
-    failed = [item for item in all_queue.values() if item.get('status') == 'failed'] if all_queue else []
-    return jsonify(failed)
+    failed, version = shared_data.get_failed_items_and_version()
+    etag = make_etag('failed', version)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    
+    # Stream the array in batches rather than encoding one large body
+    response = Response(stream_with_context(json_array_stream(failed)), mimetype='application/json')
+    response.set_etag(etag)
+    return response
 
 @app.route('/admin/queue/retry/<barcode>', methods=['POST'])
 def retry_barcode(barcode):
     """Retry a failed barcode - add back to pending queue"""
+    # Don't answer the retry from a cached response
+    forget_cached_lookup(barcode)
     success = shared_data.add_pending_barcode(barcode)
     if success:
+        wake_worker()
         # Record scan activity for catalog rebuild tracking
         shared_data.record_scan_activity()
         return jsonify({'success': True, 'message': f'Barcode {barcode} queued for retry'})
@@ -426,12 +941,19 @@ def retry_barcode(barcode):
 @app.route('/admin/queue/no-coverart')
 def no_coverart_list():
     """Get list of albums without cover art"""
-    albums = shared_data.get_no_coverart_cache()
-    return jsonify(albums)
+    albums, version = shared_data.get_no_coverart_and_version()
+    etag = make_etag('no-coverart', version)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    
+    response = jsonify(albums)
+    response.set_etag(etag)
+    return response
 
 @app.route('/admin/queue/retry-coverart/<barcode>', methods=['POST'])
 def retry_coverart(barcode):
-    """Retry cover art download for a specific barcode"""
+    """Queue a cover art download retry for a specific barcode (the worker does the download)"""
     try:
         # Find the album in catalog to get MBID
         album = shared_data.get_catalog_item(barcode)
@@ -442,45 +964,50 @@ def retry_coverart(barcode):
         if not mbid:
             return jsonify({'success': False, 'error': 'No MusicBrainz ID available for this album'}), 400
         
-        # Import the MusicBrainz client
-        from async_musicbrainz import RateLimitedMusicBrainz
-        from rate_limiter import AdaptiveRateLimiter
-        
-        rate_limiter = AdaptiveRateLimiter()
-        mb_client = RateLimitedMusicBrainz(rate_limiter)
+        if not shared_data.add_coverart_retry(barcode, mbid):
+            return jsonify({'success': False, 'error': 'Failed to queue cover art retry'}), 500
+        wake_worker()
         
-        # Attempt to download cover art
-        success = mb_client.download_cover_art(mbid, barcode, 'coverart')
-        
-        if success:
-            # Remove from no_coverart.csv if download was successful
-            remove_from_no_coverart_csv(barcode)
-            
-            # Update shared data cache to reflect the change
-            update_no_coverart_cache()
-            
-            return jsonify({
-                'success': True, 
-                'message': f'Cover art downloaded successfully for {album.get("Artist", "Unknown")} - {album.get("Album/Release", "Unknown")}'
-            })
-        else:
-            return jsonify({
-                'success': False, 
-                'error': 'Cover art not available or download failed'
-            })
+        # Poll GET on this URL for the outcome
+        return jsonify({
+            'success': True,
+            'status': 'pending',
+            'message': f'Cover art retry queued for {album.get("Artist", "Unknown")} - {album.get("Album/Release", "Unknown")}'
+        }), 202
             
     except Exception as e:
         print(f"Error retrying cover art for {barcode}: {e}")
-        import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/admin/queue/retry-coverart/<barcode>', methods=['GET'])
+def retry_coverart_status(barcode):
+    """Get the state of a queued cover art retry"""
+    retry = shared_data.get_coverart_retry_status(barcode)
+    if not retry:
+        return jsonify({'success': False, 'error': 'No cover art retry queued for this barcode'}), 404
+    return jsonify({'success': True, 'barcode': barcode, 'status': retry['status'], 'updated': retry.get('updated')})
+
 @app.route('/admin/catalog')
 def catalog():
     """Catalog review page"""
+    # The page only depends on the catalog and the starred albums, so repeat views can skip the render.
+    # The starred set and its version are read together (star/unstar swap both under _starred_lock),
+    # and the catalog version before the catalog, so a concurrent change can only cause a refetch
+    with _starred_lock:
+        starred_albums = load_starred_albums()
+        starred_version = _STARRED_ALBUMS_CACHE['version']
+    etag = make_etag('catalog-page', shared_data.catalog_version(), starred_version)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    
     catalog_data = shared_data.get_catalog_cache()
-    starred_albums = load_starred_albums()
-    return render_template('catalog.html', catalog=catalog_data, starred_albums=starred_albums)
+    # Stream the page so large catalogs start rendering in the browser before Jinja finishes
+    stream = stream_template('catalog.html', catalog=catalog_data, starred_albums=starred_albums)
+    response = Response(chunked(stream), mimetype='text/html')
+    response.set_etag(etag)
+    return response
 
 @app.route('/admin/missing-coverart')
 def missing_coverart():
@@ -488,20 +1015,32 @@ def missing_coverart():
     albums = shared_data.get_no_coverart_cache()
     
     # Enrich albums with MBID data from catalog
+    catalog_items = shared_data.get_catalog_items([album.get('Barcode') for album in albums])
     enriched_albums = []
     for album in albums:
-        catalog_item = shared_data.get_catalog_item(album.get('Barcode'))
+        catalog_item = catalog_items.get(album.get('Barcode'))
         if catalog_item:
-            album['MBID'] = catalog_item.get('MusicBrainz ID')
+            # Copy rather than mutate: the no cover art rows are shared cached data
+            album = dict(album, MBID=catalog_item.get('MusicBrainz ID'))
         enriched_albums.append(album)
     
-    return render_template('missing_coverart.html', albums=enriched_albums)
+    # Stream like the catalog page: a long backlog starts rendering before Jinja finishes
+    stream = stream_template('missing_coverart.html', albums=enriched_albums)
+    return Response(chunked(stream), mimetype='text/html')
 
 @app.route('/admin/starred-tracks')
 def starred_tracks():
     """Starred tracks page"""
-    starred_tracks = get_enriched_starred_tracks()
-    return render_template('starred_tracks.html', starred_tracks=starred_tracks)
+    cache_key = _enriched_starred_tracks_key()
+    etag = make_etag('starred-tracks', *cache_key)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    
+    starred_tracks = _build_enriched_starred_tracks(cache_key)
+    response = app.make_response(render_template('starred_tracks.html', starred_tracks=starred_tracks))
+    response.set_etag(etag)
+    return response
 
 @app.route('/star/<barcode>/<track_number>', methods=['POST'])
 def star_track_endpoint(barcode, track_number):
@@ -526,8 +1065,8 @@ def unstar_track_endpoint(barcode, track_number):
 @app.route('/admin/album/<barcode>')
 def album_detail(barcode):
     """Full album details view"""
-    # Find the album in catalog (using shared data)
-    album = shared_data.get_catalog_item(barcode)
+    # Find the album in catalog (indexed lookup, no catalog scan)
+    album = find_catalog_album(barcode)
     
     if not album:
         return "Album not found", 404
@@ -573,20 +1112,35 @@ def unstar_album_endpoint(barcode):
 def api_get_catalog():
     """API endpoint to get full catalog data"""
     try:
+        # Take the ETag before reading so a concurrent rebuild can only cause a refetch
+        etag = make_etag('catalog', shared_data.catalog_version())
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        
         catalog_data = shared_data.get_catalog_cache()
-        return jsonify({
-            'success': True,
-            'catalog': catalog_data,
-            'count': len(catalog_data)
-        })
+        
+        def generate():
+            # Emit the same payload as jsonify would, a batch of rows at a time
+            yield '{"success":true,"catalog":'
+            yield from json_array_stream(catalog_data)
+            yield ',"count":%d}' % len(catalog_data)
+        
+        response = Response(stream_with_context(generate()), mimetype='application/json')
+        response.set_etag(etag)
+        return response
     except Exception as e:
         print(f"Error getting catalog: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/api/album/<barcode>', methods=['GET'])
 def api_get_album(barcode):
-    """API endpoint to get album details and tracks"""
+    """API endpoint to get everything the album page needs in one response"""
     try:
+        cached = not_modified(album_etag(barcode))
+        if cached is not None:
+            return cached
+        
         # Get album data
         album = shared_data.get_catalog_item(barcode)
         if not album:
@@ -604,13 +1158,20 @@ def api_get_album(barcode):
         starred_albums = load_starred_albums()
         album_starred = barcode in starred_albums
         
-        return jsonify({
+        # Tell the client up front whether there is an image, so it doesn't request one that 404s
+        has_cover = barcode in shared_data.get_coverart_barcodes()
+        
+        response = jsonify({
             'success': True,
             'album': album,
             'tracks': tracks,
             'starred_tracks': list(starred_set),
-            'album_starred': album_starred
+            'album_starred': album_starred,
+            'cover_url': f"/static/coverart/{barcode}.jpg" if has_cover else None
         })
+        # Computed after the fact: fetching missing tracks may have updated the tracks cache
+        response.set_etag(album_etag(barcode))
+        return response
     except Exception as e:
         print(f"Error getting album {barcode}: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -632,12 +1193,11 @@ def api_sync_starred_albums():
         
         # Save starred albums backup
         backup_file = os.path.join(backup_dir, f'{sync_id}_albums.json')
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'syncId': sync_id,
-                'starredAlbums': starred_albums,
-                'lastUpdated': shared_data.get_current_timestamp()
-            }, f, indent=2)
+        write_json_file(backup_file, {
+            'syncId': sync_id,
+            'starredAlbums': starred_albums,
+            'lastUpdated': shared_data.get_current_timestamp()
+        })
         
         return jsonify({
             'success': True,
@@ -657,8 +1217,7 @@ def api_get_starred_albums_backup(sync_id):
         if not os.path.exists(backup_file):
             return jsonify({'success': False, 'error': 'Backup not found'}), 404
         
-        with open(backup_file, 'r', encoding='utf-8') as f:
-            backup_data = json.load(f)
+        backup_data = read_json_file(backup_file)
         
         return jsonify({
             'success': True,
@@ -685,12 +1244,11 @@ def api_sync_starred_tracks():
         
         # Save starred tracks backup
         backup_file = os.path.join(backup_dir, f'{sync_id}_tracks.json')
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'syncId': sync_id,
-                'starredTracks': starred_tracks,
-                'lastUpdated': shared_data.get_current_timestamp()
-            }, f, indent=2)
+        write_json_file(backup_file, {
+            'syncId': sync_id,
+            'starredTracks': starred_tracks,
+            'lastUpdated': shared_data.get_current_timestamp()
+        })
         
         return jsonify({
             'success': True,
@@ -710,8 +1268,7 @@ def api_get_starred_tracks_backup(sync_id):
         if not os.path.exists(backup_file):
             return jsonify({'success': False, 'error': 'Backup not found'}), 404
         
-        with open(backup_file, 'r', encoding='utf-8') as f:
-            backup_data = json.load(f)
+        backup_data = read_json_file(backup_file)
         
         return jsonify({
             'success': True,
@@ -780,29 +1337,16 @@ def react_app_routes(path=''):
     """Serve the React SPA for specific frontend routes"""
     return serve_react_app(path)
 
-def serve_react_app(path):
-    try:
-        # Check if built files exist
-        bundle_js = os.path.join('static', 'dist', 'bundle.js')
-        bundle_css = os.path.join('static', 'dist', 'bundle.css')
-        
-        if not os.path.exists(bundle_js):
-            return render_template_string("""
-                <h1>React App Not Built</h1>
-                <p>The React application has not been built yet.</p>
-                <p>To build the React app, run:</p>
-                <pre>npm install && npm run build</pre>
-                <p><a href="/admin">← Admin Tools</a></p>
-            """), 404
-        
-        # Serve the built index.html file
-        index_file = os.path.join('static', 'dist', 'index.html')
-        if os.path.exists(index_file):
-            with open(index_file, 'r') as f:
-                return f.read()
-        else:
-            # Fallback template with module script
-            return render_template_string("""
+# Static pages for serve_react_app (plain HTML, no Jinja rendering needed)
+NOT_BUILT_HTML = """
+    <h1>React App Not Built</h1>
+    <p>The React application has not been built yet.</p>
+    <p>To build the React app, run:</p>
+    <pre>npm install && npm run build</pre>
+    <p><a href="/admin">← Admin Tools</a></p>
+"""
+
+SPA_FALLBACK_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -817,7 +1361,61 @@ def serve_react_app(path):
     <script type="module" src="/static/dist/bundle.js"></script>
 </body>
 </html>
-            """)
+"""
+
+# Vite gives chunks and assets content-hashed names, so browsers may keep them forever;
+# the fixed-name bundle.js / bundle.css (and index.html) are revalidated against their ETag instead
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+@app.after_request
+def add_static_cache_headers(response):
+    """Set Cache-Control for the built React app files"""
+    path = request.path
+    if path.startswith('/static/dist/') and response.status_code in (200, 304):
+        if path.startswith('/static/dist/assets/') or path.rsplit('/', 1)[-1].startswith('chunk-'):
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+BUNDLE_JS_FILE = os.path.join('static', 'dist', 'bundle.js')
+INDEX_HTML_FILE = os.path.join('static', 'dist', 'index.html')
+
+# The built bundle does not change under a running server, so its files are only checked once
+# (set CHECK_BUNDLE_ON_EACH_REQUEST=1, or run in debug mode, while rebuilding the front end)
+CHECK_BUNDLE_ON_EACH_REQUEST = os.getenv('CHECK_BUNDLE_ON_EACH_REQUEST') == '1'
+_bundle_state = None
+
+def get_bundle_state():
+    """Return (bundle_exists, index_exists) for the built React app"""
+    global _bundle_state
+    if _bundle_state is None or CHECK_BUNDLE_ON_EACH_REQUEST or app.debug:
+        _bundle_state = (os.path.exists(BUNDLE_JS_FILE), os.path.exists(INDEX_HTML_FILE))
+    return _bundle_state
+
+@app.route('/admin/reload-bundle-check', methods=['POST'])
+def reload_bundle_check():
+    """Re-check the built React app files (e.g. after running a build)"""
+    global _bundle_state
+    _bundle_state = None
+    bundle_exists, index_exists = get_bundle_state()
+    return jsonify({'success': True, 'bundle_exists': bundle_exists, 'index_exists': index_exists})
+
+def serve_react_app(path):
+    try:
+        # Check if built files exist
+        bundle_exists, index_exists = get_bundle_state()
+        
+        if not bundle_exists:
+            return NOT_BUILT_HTML, 404
+        
+        # Serve the built index.html file
+        if index_exists:
+            # Conditional response (ETag / Last-Modified) served straight from disk
+            return send_file(os.path.abspath(INDEX_HTML_FILE), mimetype='text/html', conditional=True)
+        else:
+            # Fallback page with module script
+            return SPA_FALLBACK_HTML
     except Exception as e:
         print(f"Error serving React app: {e}")
         return f"Error loading React app: {e}", 500
@@ -830,6 +1428,16 @@ if not SPOTIFY_CLIENT_SECRET:
     print("WARNING: SPOTIFY_CLIENT_SECRET environment variable not set!")
     print("Please add your Spotify Client Secret to the .env file")
 
+# Auth data from the OAuth callback waits here until the SPA redeems its handle (once, within the TTL)
+SPOTIFY_AUTH_HANDLE_TTL = 60
+_pending_spotify_auth = {}
+_pending_spotify_auth_lock = threading.Lock()
+
+# One pooled session for all Spotify calls so OAuth round-trips reuse kept-alive TLS connections
+SPOTIFY_SESSION = requests.Session()
+SPOTIFY_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                              max_retries=Retry(total=2, backoff_factor=0.2)))
+
 @app.route('/spotify/callback')
 def spotify_callback():
     """Handle Spotify OAuth callback"""
@@ -852,7 +1460,7 @@ def spotify_callback():
             'client_secret': SPOTIFY_CLIENT_SECRET
         }
         
-        response = requests.post('https://accounts.spotify.com/api/token', data=token_data)
+        response = SPOTIFY_SESSION.post('https://accounts.spotify.com/api/token', data=token_data)
         
         if not response.ok:
             return redirect(f'/?spotify_error=token_exchange_failed')
@@ -863,36 +1471,62 @@ def spotify_callback():
         expires_in = token_info.get('expires_in', 3600)
         expires_at = (datetime.now() + timedelta(seconds=expires_in)).isoformat()
         
-        # Get user profile
-        profile_response = requests.get('https://api.spotify.com/v1/me', 
-                                      headers={'Authorization': f"Bearer {token_info['access_token']}"})
-        
-        if profile_response.ok:
-            profile = profile_response.json()
-            spotify_user_id = profile.get('id', 'unknown')
-            spotify_display_name = profile.get('display_name') or profile.get('id', 'Unknown User')
-        else:
-            spotify_user_id = 'unknown'
-            spotify_display_name = 'Unknown User'
-        
-        # Build auth data to pass to frontend
+        # Build auth data to pass to frontend (the SPA fetches the profile via /spotify/me
+        # afterwards, so the redirect only waits on the token exchange)
         auth_data = {
             'access_token': token_info['access_token'],
             'refresh_token': token_info.get('refresh_token'),
-            'expires_at': expires_at,
-            'user_id': spotify_user_id,
-            'display_name': spotify_display_name
+            'expires_at': expires_at
         }
         
-        # Redirect back to React app with auth data in URL fragment
-        import urllib.parse
-        auth_params = urllib.parse.urlencode({'spotify_auth': json.dumps(auth_data)})
-        return redirect(f'/?{auth_params}')
+        # Keep the tokens server-side and redirect back to the React app with a short handle
+        handle = secrets.token_urlsafe(16)
+        now = time.monotonic()
+        with _pending_spotify_auth_lock:
+            for stale in [h for h, (expires, _) in _pending_spotify_auth.items() if expires <= now]:
+                del _pending_spotify_auth[stale]
+            _pending_spotify_auth[handle] = (now + SPOTIFY_AUTH_HANDLE_TTL, auth_data)
+        return redirect(f'/?spotify_auth_handle={handle}')
         
     except Exception as e:
         print(f"Spotify callback error: {e}")
         return redirect(f'/?spotify_error=callback_failed')
 
+@app.route('/spotify/consume/<handle>', methods=['POST'])
+def spotify_consume_auth(handle):
+    """Hand the auth data from the OAuth callback to the SPA (each handle works once)"""
+    with _pending_spotify_auth_lock:
+        pending = _pending_spotify_auth.pop(handle, None)
+    
+    if not pending or pending[0] <= time.monotonic():
+        return jsonify({'error': 'Unknown or expired auth handle'}), 404
+    
+    return jsonify(pending[1])
+
+@app.route('/spotify/me')
+def spotify_profile():
+    """Get the Spotify profile for the access token in the Authorization header"""
+    try:
+        auth_header = request.headers.get('Authorization', '')
+        if not auth_header.startswith('Bearer '):
+            return jsonify({'error': 'No access token provided'}), 401
+        
+        profile_response = SPOTIFY_SESSION.get('https://api.spotify.com/v1/me',
+                                               headers={'Authorization': auth_header})
+        
+        if profile_response.ok:
+            profile = profile_response.json()
+            return jsonify({
+                'user_id': profile.get('id', 'unknown'),
+                'display_name': profile.get('display_name') or profile.get('id', 'Unknown User')
+            })
+        
+        return jsonify({'error': 'Profile fetch failed'}), profile_response.status_code
+        
+    except Exception as e:
+        print(f"Spotify profile error: {e}")
+        return jsonify({'error': 'Profile fetch failed'}), 500
+
 @app.route('/spotify/refresh', methods=['POST'])
 def spotify_refresh_token():
     """Refresh Spotify access token"""
@@ -910,7 +1544,7 @@ def spotify_refresh_token():
             'client_secret': SPOTIFY_CLIENT_SECRET
         }
         
-        response = requests.post('https://accounts.spotify.com/api/token', data=token_data)
+        response = SPOTIFY_SESSION.post('https://accounts.spotify.com/api/token', data=token_data)
         
         if not response.ok:
             return jsonify({'error': 'Token refresh failed'}), 400
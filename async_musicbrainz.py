@@ -1,50 +1,249 @@
 import musicbrainzngs
 import requests
+from requests.adapters import HTTPAdapter
 import os
+import json
+import logging
+import sqlite3
+import threading
+import time
+import traceback
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 from rate_limiter import AdaptiveRateLimiter
 from version import VERSION
 
+def _bytes_to_elementtree(bytes_or_file):
+    """
+    Parse a MusicBrainz XML response straight from its bytes. musicbrainzngs decodes the
+    body to str and copies it through a StringIO first; the C parser handles the encoding itself.
+    """
+    if isinstance(bytes_or_file, (bytes, str)):
+        data = bytes_or_file
+    else:
+        data = bytes_or_file.read()
+    return ET.ElementTree(ET.fromstring(data))
+
+musicbrainzngs.util.bytes_to_elementtree = _bytes_to_elementtree
+
+# Step-by-step cover art download tracing (enable with logging.basicConfig(level=logging.DEBUG))
+log = logging.getLogger(__name__)
+
 # User agent configuration
 REPO_NAME = "musicbrainz-barcode-lookup"
 CONTACT = "vance@axxe.co.uk"
 
+# Number of barcode lookups and track listings remembered per client (least recently used are dropped)
+LOOKUP_CACHE_SIZE = 4096
+
+# On-disk copy of those caches, so a restart doesn't repeat MusicBrainz requests
+# (entries are keyed by VERSION, so an upgrade starts from an empty cache)
+RESPONSE_CACHE_DB = 'mb_cache.db'
+
+# How long a cached response is used before MusicBrainz is asked again, so corrections made there
+# are picked up (seconds). Expired rows are deleted when a client opens the cache.
+RESPONSE_CACHE_TTL = 30 * 24 * 3600
+
+# Barcodes OR-ed into one search query by lookup_by_barcodes (a search returns at most 100 hits)
+BARCODE_BATCH_SIZE = 50
+
+# Read size when streaming a cover art image to disk
+COVER_ART_CHUNK_SIZE = 64 * 1024
+
+# Maximum cover art downloads in flight at once (requests are still spaced by the rate limiter)
+COVER_ART_CONCURRENCY = 4
+
 class RateLimitedMusicBrainz:
     """
     Rate-limited wrapper around MusicBrainz API that respects their limits
     and implements adaptive backoff on 503 errors.
     """
     
-    def __init__(self, rate_limiter: AdaptiveRateLimiter):
+    # Front cover image for a release MBID, and the file name it is saved under for a barcode
+    CAA_FRONT_URL = "https://coverartarchive.org/release/%s/front"
+    COVER_ART_FILENAME = "%s.jpg"
+    
+    # Sidecar file next to an image holding its ETag, so a later refresh can be revalidated with a 304
+    COVER_ART_ETAG_SUFFIX = ".etag"
+    
+    def __init__(self, rate_limiter: AdaptiveRateLimiter, cache_db_path: str = RESPONSE_CACHE_DB):
         self.rate_limiter = rate_limiter
+        self.cache_db_path = cache_db_path
         
         # Initialize MusicBrainz client
         musicbrainzngs.set_useragent(REPO_NAME, VERSION, CONTACT)
         
-    def lookup_by_barcode(self, barcode: str) -> Optional[Dict[str, Any]]:
+        # Pooled session for Cover Art Archive downloads, so each image reuses a kept-alive
+        # TLS connection (the archive redirects to archive.org, hence both schemes)
+        self._http = requests.Session()
+        self._http.headers.update({'User-Agent': f"{REPO_NAME}/{VERSION} ({CONTACT})"})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=0)
+        self._http.mount('https://', adapter)
+        self._http.mount('http://', adapter)
+        
+        # Successful responses, so repeated barcodes and releases skip the rate-limited round trip
+        self._lookup_cache = OrderedDict()
+        self._tracks_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._init_disk_cache()
+        
+        # Cover art folders already created -> their path prefix (folder plus separator), so makedirs
+        # and path joining run once per folder rather than per image
+        self._folder_prefixes = {}
+        
+        # Cover art downloads run here so callers can carry on with MusicBrainz requests meanwhile
+        # (the rate limiter still spaces out when requests start; the pool lets slow transfers overlap).
+        # Created on first use, and again after close() so a restarted worker can reuse the client
+        self._caa_pool = None
+        self._caa_pool_lock = threading.Lock()
+    
+    @contextmanager
+    def _get_connection(self):
+        """Get response cache database connection"""
+        conn = sqlite3.connect(self.cache_db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+    
+    def _init_disk_cache(self):
+        """Create the response cache table if needed"""
+        try:
+            with self._get_connection() as conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL,
+                        fetched_at REAL NOT NULL DEFAULT 0
+                    )
+                ''')
+                # Caches created before entries expired have no fetched_at; their rows count as expired
+                columns = [row[1] for row in conn.execute('PRAGMA table_info(responses)')]
+                if 'fetched_at' not in columns:
+                    conn.execute('ALTER TABLE responses ADD COLUMN fetched_at REAL NOT NULL DEFAULT 0')
+                conn.execute('DELETE FROM responses WHERE fetched_at < ?', (time.time() - RESPONSE_CACHE_TTL,))
+                conn.commit()
+        except Exception as e:
+            print(f"Warning: Could not create response cache {self.cache_db_path}: {e}")
+    
+    def _disk_key(self, cache: OrderedDict, key: str) -> str:
+        """Key for a cached response on disk"""
+        kind = 'lookup' if cache is self._lookup_cache else 'tracks'
+        return _response_cache_key(kind, key)
+    
+    def _cache_get(self, cache: OrderedDict, key: str):
+        """Return a cached response (marking it recently used), or None"""
+        cutoff = time.time() - RESPONSE_CACHE_TTL
+        with self._cache_lock:
+            entry = cache.get(key)
+            if entry is not None:
+                if entry[0] >= cutoff:
+                    cache.move_to_end(key)
+                    return entry[1]
+                del cache[key]
+        
+        try:
+            with self._get_connection() as conn:
+                row = conn.execute('SELECT value, fetched_at FROM responses WHERE key = ? AND fetched_at >= ?',
+                                   (self._disk_key(cache, key), cutoff)).fetchone()
+        except Exception as e:
+            print(f"Warning: Could not read response cache: {e}")
+            return None
+        if row is None:
+            return None
+        
+        value = json.loads(row[0])
+        self._remember(cache, key, value, row[1])
+        return value
+    
+    def _cache_put(self, cache: OrderedDict, key: str, value):
+        """Remember a response in memory and on disk"""
+        fetched_at = time.time()
+        self._remember(cache, key, value, fetched_at)
+        try:
+            with self._get_connection() as conn:
+                conn.execute('INSERT OR REPLACE INTO responses (key, value, fetched_at) VALUES (?, ?, ?)',
+                             (self._disk_key(cache, key), json.dumps(value), fetched_at))
+                conn.commit()
+        except Exception as e:
+            print(f"Warning: Could not write response cache: {e}")
+    
+    def _remember(self, cache: OrderedDict, key: str, value, fetched_at: float):
+        """Keep a response in memory, dropping the least recently used one when full"""
+        with self._cache_lock:
+            cache[key] = (fetched_at, value)
+            cache.move_to_end(key)
+            if len(cache) > LOOKUP_CACHE_SIZE:
+                cache.popitem(last=False)
+    
+    def forget_barcode(self, barcode: str):
+        """
+        Drop the cached lookup for a barcode, and the track listing of the release it found,
+        so the next lookup asks MusicBrainz again (e.g. when an admin retries it after a correction).
+        """
+        with self._cache_lock:
+            entry = self._lookup_cache.pop(barcode, None)
+        mbids = set()
+        if entry is not None:
+            mbids.add(entry[1]['release']['id'])
+        mbids.update(forget_cached_barcode(barcode, self.cache_db_path))
+        with self._cache_lock:
+            for mbid in mbids:
+                self._tracks_cache.pop(mbid, None)
+    
+    def close(self):
+        """Wait for queued cover art downloads, then close the pooled HTTP connections"""
+        with self._caa_pool_lock:
+            pool, self._caa_pool = self._caa_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        self._http.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        
+    def lookup_by_barcode(self, barcode: str, need_release_group: bool = True) -> Optional[Dict[str, Any]]:
         """
         Look up a release by barcode with rate limiting and error handling.
         Returns the same format as MusicBrainzBarcodeLookup.lookup_by_barcode()
+        
+        The release group's first release date needs a second request; callers that don't use
+        it can pass need_release_group=False, and full_release is then the search hit itself.
         """
+        cached = self._cache_get(self._lookup_cache, barcode)
+        if cached is not None and (not need_release_group or _has_first_release_date(cached['full_release'])):
+            return cached
+        
         self.rate_limiter.wait_if_needed()
         
         try:
-            # Search for releases by barcode
-            result = musicbrainzngs.search_releases(barcode=barcode)
+            # Search for releases by barcode (only the best match is used)
+            result = musicbrainzngs.search_releases(barcode=barcode, limit=1)
             
             if result.get('release-list'):
                 release = result['release-list'][0]
                 mbid = release['id']
                 
-                # Get full release info with release groups
-                full_release = musicbrainzngs.get_release_by_id(mbid, includes=['release-groups'])
+                full_release = release
+                if need_release_group and not _has_first_release_date(release):
+                    # Get full release info with release groups (and the track listing, see _fetch_full_release)
+                    full_release = self._fetch_full_release(mbid)
                 
                 self.rate_limiter.on_request_success()
                 
-                return {
+                result = {
                     'release': release,
-                    'full_release': full_release['release']
+                    'full_release': full_release
                 }
+                # "Not found" isn't cached: the release may be added to MusicBrainz before a retry
+                self._cache_put(self._lookup_cache, barcode, result)
+                return result
             else:
                 self.rate_limiter.on_request_success()
                 return None
@@ -60,26 +259,107 @@ class RateLimitedMusicBrainz:
             self.rate_limiter.on_other_error()
             raise MusicBrainzError(f"Unexpected error: {e}")
     
+    def lookup_by_barcodes(self, barcodes: List[str], need_release_group: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up several barcodes, searching for up to BARCODE_BATCH_SIZE of them per request.
+        Returns barcode -> result (as lookup_by_barcode would) for the barcodes found. Any the
+        batched searches miss are left out rather than searched for again one by one; pass those
+        to lookup_by_barcode, which also handles barcodes stored differently (e.g. leading zeros).
+        """
+        results = {}
+        pending = []
+        for barcode in dict.fromkeys(barcodes):
+            cached = self._cache_get(self._lookup_cache, barcode)
+            if cached is not None and (not need_release_group or _has_first_release_date(cached['full_release'])):
+                results[barcode] = cached
+            elif barcode.isalnum():
+                pending.append(barcode)
+            # Anything else isn't safe to put in a search query, so it is left for lookup_by_barcode
+        
+        for start in range(0, len(pending), BARCODE_BATCH_SIZE):
+            batch = pending[start:start + BARCODE_BATCH_SIZE]
+            self.rate_limiter.wait_if_needed()
+            try:
+                query = ' OR '.join(f'barcode:{barcode}' for barcode in batch)
+                found = musicbrainzngs.search_releases(query=query, limit=100)
+                self.rate_limiter.on_request_success()
+            except musicbrainzngs.WebServiceError as e:
+                if hasattr(e, 'code') and e.code == 503:
+                    self.rate_limiter.on_503_error()
+                    raise ServiceUnavailableError(f"MusicBrainz service unavailable: {e}")
+                else:
+                    self.rate_limiter.on_other_error()
+                    raise MusicBrainzError(f"MusicBrainz API error: {e}")
+            except Exception as e:
+                self.rate_limiter.on_other_error()
+                raise MusicBrainzError(f"Unexpected error: {e}")
+            
+            # Hits come back best match first, so keep the first release seen for each barcode
+            releases = {}
+            for release in found.get('release-list', []):
+                releases.setdefault(release.get('barcode'), release)
+            
+            for barcode in batch:
+                if barcode in releases:
+                    results[barcode] = self._release_result(barcode, releases[barcode], need_release_group)
+        
+        return results
+    
+    def _release_result(self, barcode: str, release: Dict[str, Any], need_release_group: bool) -> Dict[str, Any]:
+        """Build (and cache) a lookup result for a release found by a batched search"""
+        full_release = release
+        if need_release_group and not _has_first_release_date(release):
+            self.rate_limiter.wait_if_needed()
+            try:
+                full_release = self._fetch_full_release(release['id'])
+                self.rate_limiter.on_request_success()
+            except musicbrainzngs.WebServiceError as e:
+                if hasattr(e, 'code') and e.code == 503:
+                    self.rate_limiter.on_503_error()
+                    raise ServiceUnavailableError(f"MusicBrainz service unavailable: {e}")
+                else:
+                    self.rate_limiter.on_other_error()
+                    raise MusicBrainzError(f"MusicBrainz API error: {e}")
+            except Exception as e:
+                self.rate_limiter.on_other_error()
+                raise MusicBrainzError(f"Unexpected error: {e}")
+        
+        result = {
+            'release': release,
+            'full_release': full_release
+        }
+        self._cache_put(self._lookup_cache, barcode, result)
+        return result
+    
+    def _fetch_full_release(self, mbid: str) -> Dict[str, Any]:
+        """
+        Fetch a release with its release group, including recordings in the same request
+        so the track listing is cached and get_track_names doesn't need a request of its own.
+        """
+        full_release = musicbrainzngs.get_release_by_id(mbid, includes=['release-groups', 'recordings'])['release']
+        tracks = _track_names(full_release)
+        if tracks:
+            self._cache_put(self._tracks_cache, mbid, tracks)
+        return full_release
+    
     def get_track_names(self, mbid: str) -> Optional[List[str]]:
         """
         Get track names for a release MBID with rate limiting.
         """
+        cached = self._cache_get(self._tracks_cache, mbid)
+        if cached is not None:
+            return cached
+        
         self.rate_limiter.wait_if_needed()
         
         try:
             # Request the release with recordings included
             result = musicbrainzngs.get_release_by_id(mbid, includes=["recordings"])
-            tracks = []
-            
-            # Extract track names from medium list
-            mediums = result['release'].get('medium-list', [])
-            for medium in mediums:
-                for track in medium.get('track-list', []):
-                    title = track.get('recording', {}).get('title')
-                    if title:
-                        tracks.append(title)
+            tracks = _track_names(result['release'])
             
             self.rate_limiter.on_request_success()
+            if tracks:
+                self._cache_put(self._tracks_cache, mbid, tracks)
             return tracks
             
         except musicbrainzngs.WebServiceError as e:
@@ -93,111 +373,150 @@ class RateLimitedMusicBrainz:
             self.rate_limiter.on_other_error()
             raise MusicBrainzError(f"Unexpected error: {e}")
     
-    def download_cover_art(self, mbid: str, barcode: str, folder: str = "coverart") -> bool:
+    def download_cover_art(self, mbid: str, barcode: str, folder: str = "coverart", refresh: bool = False) -> bool:
         """
         Download cover art for a release MBID with rate limiting.
         Returns True if successful, False if no cover art available.
+        
+        An existing image is kept as is unless refresh=True, in which case it is revalidated
+        with its saved ETag and only downloaded again if the archive's copy has changed.
+        The ETag sidecar is only written for refresh downloads, so ordinary downloads don't
+        leave one next to every image in the (publicly served) folder.
         """
-        import traceback
+        log.debug("[COVER ART] Starting download for barcode=%s, mbid=%s", barcode, mbid)
         
-        print(f"[COVER ART] Starting download for barcode={barcode}, mbid={mbid}")
+        prefix = self._folder_prefixes.get(folder)
+        if prefix is None:
+            try:
+                os.makedirs(folder, exist_ok=True)
+            except Exception as e:
+                print(f"[COVER ART ERROR] Failed to create folder {folder}: {e}")
+                traceback.print_exc()
+                return False
+            prefix = self._folder_prefixes[folder] = os.path.join(folder, '')
+        
+        dest_path = prefix + self.COVER_ART_FILENAME % barcode
+        etag_path = dest_path + self.COVER_ART_ETAG_SUFFIX
+        
+        # Check if file already exists
+        file_size = _file_size_or_none(dest_path)
+        etag = None
+        if file_size and not refresh:
+            log.debug("[COVER ART] %s already exists (%d bytes), skipping download", dest_path, file_size)
+            return True
+        elif file_size:
+            etag = _read_etag(etag_path)
+        elif file_size == 0:
+            log.debug("[COVER ART] %s is empty, will re-download", dest_path)
         
         # Cover Art Archive doesn't count against MusicBrainz rate limits,
-        # but we still apply a small delay to be respectful
+        # but we still apply a small delay to be respectful (only once we know a request is needed)
         try:
             self.rate_limiter.wait_if_needed()
-            print(f"[COVER ART] Rate limiter passed for {barcode}")
+            log.debug("[COVER ART] Rate limiter passed for %s", barcode)
         except Exception as e:
             print(f"[COVER ART ERROR] Rate limiter failed for {barcode}: {e}")
             return False
         
-        url = f"https://coverartarchive.org/release/{mbid}/front"
-        print(f"[COVER ART] URL: {url}")
+        url = self.CAA_FRONT_URL % mbid
+        log.debug("[COVER ART] URL: %s", url)
         
         try:
-            os.makedirs(folder, exist_ok=True)
-            print(f"[COVER ART] Folder ensured: {folder}")
-        except Exception as e:
-            print(f"[COVER ART ERROR] Failed to create folder {folder}: {e}")
-            traceback.print_exc()
-            return False
-        
-        dest_path = os.path.join(folder, f"{barcode}.jpg")
-        print(f"[COVER ART] Destination path: {dest_path}")
-        
-        # Check if file already exists
-        if os.path.exists(dest_path):
-            file_size = os.path.getsize(dest_path)
-            print(f"[COVER ART] File already exists: {dest_path} (size: {file_size} bytes)")
-            if file_size > 0:
-                print(f"[COVER ART] Existing file is valid, skipping download")
-                return True
-            else:
-                print(f"[COVER ART] Existing file is empty, will re-download")
-        
-        try:
-            print(f"[COVER ART] Making HTTP request to {url}")
-            response = requests.get(url, timeout=30, allow_redirects=True)
-            print(f"[COVER ART] HTTP response: {response.status_code}")
-            print(f"[COVER ART] Response headers: {dict(response.headers)}")
-            print(f"[COVER ART] Content length: {len(response.content)} bytes")
-            
-            if response.status_code == 200:
-                if len(response.content) == 0:
-                    print(f"[COVER ART ERROR] Response has no content for {barcode}")
-                    return False
+            # Stream the image to disk rather than holding the whole body in memory
+            headers = {'If-None-Match': etag} if etag else None
+            with self._http.get(url, headers=headers, timeout=30, allow_redirects=True, stream=True) as response:
+                log.debug("[COVER ART] HTTP response for %s: %s", barcode, response.status_code)
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("[COVER ART] Response headers: %s", dict(response.headers))
                 
-                try:
-                    with open(dest_path, "wb") as f:
-                        f.write(response.content)
-                    print(f"[COVER ART] File written to {dest_path}")
-                    
-                    # Verify file was written correctly
-                    if os.path.exists(dest_path):
-                        actual_size = os.path.getsize(dest_path)
-                        print(f"[COVER ART] File verification: exists={os.path.exists(dest_path)}, size={actual_size}")
-                        if actual_size > 0:
-                            print(f"[COVER ART SUCCESS] Downloaded cover art to {dest_path} ({actual_size} bytes)")
-                            return True
-                        else:
-                            print(f"[COVER ART ERROR] File was created but is empty: {dest_path}")
+                if response.status_code == 200:
+                    # Write to a temp name so a partial image is never picked up as cover art
+                    tmp_path = dest_path + '.part'
+                    try:
+                        with open(tmp_path, "wb") as f:
+                            for chunk in response.iter_content(chunk_size=COVER_ART_CHUNK_SIZE):
+                                f.write(chunk)
+                        
+                        actual_size = _file_size_or_none(tmp_path)
+                        if not actual_size:
+                            print(f"[COVER ART ERROR] Response has no content for {barcode}")
+                            os.remove(tmp_path)
                             return False
-                    else:
-                        print(f"[COVER ART ERROR] File does not exist after write attempt: {dest_path}")
+                        
+                        os.replace(tmp_path, dest_path)
+                        # Clears any sidecar left from an earlier refresh when this isn't one
+                        _write_etag(etag_path, response.headers.get('ETag') if refresh else None)
+                        print(f"[COVER ART SUCCESS] Downloaded cover art to {dest_path} ({actual_size} bytes)")
+                        return True
+                            
+                    except IOError as e:
+                        print(f"[COVER ART ERROR] File write failed for {dest_path}: {e}")
+                        traceback.print_exc()
+                        try:
+                            os.remove(tmp_path)
+                        except FileNotFoundError:
+                            pass
                         return False
                         
-                except IOError as e:
-                    print(f"[COVER ART ERROR] File write failed for {dest_path}: {e}")
-                    traceback.print_exc()
+                elif response.status_code == 304:
+                    log.debug("[COVER ART] %s is unchanged (304 Not Modified)", dest_path)
+                    return True
+                elif response.status_code == 404:
+                    # The body is never read (the response is streamed), so a miss costs only the headers
+                    print(f"[COVER ART] No cover art available for MBID {mbid} (404 Not Found)")
+                    return False
+                elif response.status_code == 503:
+                    print(f"[COVER ART ERROR] Cover Art Archive temporarily unavailable for MBID {mbid} (503 Service Unavailable)")
+                    return False
+                else:
+                    print(f"[COVER ART ERROR] Cover art download failed for MBID {mbid} (HTTP {response.status_code})")
+                    log.debug("[COVER ART ERROR] Response text: %.200s", response.text)
                     return False
-                    
-            elif response.status_code == 404:
-                print(f"[COVER ART] No cover art available for MBID {mbid} (404 Not Found)")
-                return False
-            elif response.status_code == 503:
-                print(f"[COVER ART ERROR] Cover Art Archive temporarily unavailable for MBID {mbid} (503 Service Unavailable)")
-                return False
-            else:
-                print(f"[COVER ART ERROR] Cover art download failed for MBID {mbid} (HTTP {response.status_code})")
-                print(f"[COVER ART ERROR] Response text: {response.text[:200]}...")
-                return False
                 
         except requests.exceptions.Timeout as e:
+            # Network failures are expected from time to time; the traceback is only useful when debugging
             print(f"[COVER ART ERROR] Timeout downloading cover art for MBID {mbid}: {e}")
-            traceback.print_exc()
+            log.debug("Timeout traceback", exc_info=True)
             return False
         except requests.exceptions.ConnectionError as e:
             print(f"[COVER ART ERROR] Connection error downloading cover art for MBID {mbid}: {e}")
-            traceback.print_exc()
+            log.debug("Connection error traceback", exc_info=True)
             return False
         except requests.exceptions.RequestException as e:
             print(f"[COVER ART ERROR] Request exception downloading cover art for MBID {mbid}: {e}")
-            traceback.print_exc()
+            log.debug("Request exception traceback", exc_info=True)
             return False
         except Exception as e:
             print(f"[COVER ART ERROR] Unexpected error downloading cover art for MBID {mbid}: {e}")
             traceback.print_exc()
             return False
+    
+    def download_cover_art_async(self, mbid: str, barcode: str, folder: str = "coverart", refresh: bool = False) -> Future:
+        """
+        Start a cover art download in the background.
+        Returns a Future whose result is what download_cover_art would return.
+        """
+        with self._caa_pool_lock:
+            if self._caa_pool is None:
+                self._caa_pool = ThreadPoolExecutor(max_workers=COVER_ART_CONCURRENCY)
+            return self._caa_pool.submit(self.download_cover_art, mbid, barcode, folder, refresh)
+    
+    def download_cover_art_batch(self, releases: Dict[str, str], folder: str = "coverart", refresh: bool = False) -> Dict[str, bool]:
+        """
+        Download cover art for several releases (barcode -> MBID) concurrently.
+        Returns barcode -> True/False as download_cover_art would.
+        """
+        futures = {barcode: self.download_cover_art_async(mbid, barcode, folder, refresh)
+                   for barcode, mbid in releases.items()}
+        
+        results = {}
+        for barcode, future in futures.items():
+            try:
+                results[barcode] = future.result()
+            except Exception as e:
+                print(f"[COVER ART ERROR] Unexpected error downloading cover art for {barcode}: {e}")
+                results[barcode] = False
+        return results
 
 
 class MusicBrainzError(Exception):
@@ -210,9 +529,93 @@ class ServiceUnavailableError(MusicBrainzError):
     pass
 
 
+def _file_size_or_none(path: str) -> Optional[int]:
+    """Size of a file from a single stat() call, or None if it doesn't exist"""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return None
+
+
+def _track_names(release: Dict[str, Any]) -> List[str]:
+    """Track titles of a release fetched with recordings included"""
+    tracks = []
+    
+    # Extract track names from medium list
+    for medium in release.get('medium-list', []):
+        for track in medium.get('track-list', []):
+            title = track.get('recording', {}).get('title')
+            if title:
+                tracks.append(title)
+    return tracks
+
+
+def _response_cache_key(kind: str, key: str) -> str:
+    """Key for a cached response in the response cache database"""
+    return f"{VERSION}:{kind}:{key}"
+
+
+def forget_cached_barcode(barcode: str, cache_db_path: str = RESPONSE_CACHE_DB) -> List[str]:
+    """
+    Delete a barcode's cached lookup, and its release's track listing, from the response cache
+    database. Returns the MBID of the release it had found, if any.
+    """
+    mbids = []
+    try:
+        conn = sqlite3.connect(cache_db_path)
+        try:
+            lookup_key = _response_cache_key('lookup', barcode)
+            row = conn.execute('SELECT value FROM responses WHERE key = ?', (lookup_key,)).fetchone()
+            if row is not None:
+                mbid = json.loads(row[0])['release']['id']
+                mbids.append(mbid)
+                conn.execute('DELETE FROM responses WHERE key = ?', (_response_cache_key('tracks', mbid),))
+            conn.execute('DELETE FROM responses WHERE key = ?', (lookup_key,))
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Warning: Could not clear cached lookup for {barcode}: {e}")
+    return mbids
+
+
+def _read_etag(path: str) -> Optional[str]:
+    """ETag saved next to a cover art image, or None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except (IOError, ValueError):
+        return None
+
+
+def _write_etag(path: str, etag: Optional[str]):
+    """Save (or clear) the ETag for a cover art image"""
+    try:
+        if etag:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(etag)
+        else:
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+    except IOError as e:
+        print(f"[COVER ART ERROR] Could not save ETag {path}: {e}")
+
+
+def _has_first_release_date(release: Dict[str, Any]) -> bool:
+    """Check whether a release already carries its release group's first release date"""
+    return 'first-release-date' in (release.get('release-group') or {})
+
+
+# Metadata already extracted, keyed by release MBID and whether the release group date was present
+_metadata_cache = OrderedDict()
+_metadata_cache_lock = threading.Lock()
+
+
 def extract_metadata_from_result(result: Dict[str, Any]) -> Dict[str, str]:
     """
     Extract key metadata from MusicBrainz result for database storage.
+    The returned dict is shared between calls for the same release, so don't modify it.
     """
     if not result:
         return {}
@@ -220,14 +623,28 @@ def extract_metadata_from_result(result: Dict[str, Any]) -> Dict[str, str]:
     release = result.get('release', {})
     full_release = result.get('full_release', {})
     
+    key = None
+    if release.get('id'):
+        key = (release['id'], _has_first_release_date(full_release))
+        with _metadata_cache_lock:
+            cached = _metadata_cache.get(key)
+            if cached is not None:
+                _metadata_cache.move_to_end(key)
+                return cached
+    
     # Extract artist name
     artist = "Unknown Artist"
     artist_credit = release.get('artist-credit')
     if artist_credit and isinstance(artist_credit, list):
-        for credit in artist_credit:
-            if isinstance(credit, dict) and 'artist' in credit:
-                artist = credit['artist'].get('name', artist)
-                break
+        # The first credit is nearly always the artist; join phrases are strings between credits
+        first = artist_credit[0]
+        if isinstance(first, dict) and 'artist' in first:
+            artist = first['artist'].get('name', artist)
+        else:
+            for credit in artist_credit:
+                if isinstance(credit, dict) and 'artist' in credit:
+                    artist = credit['artist'].get('name', artist)
+                    break
     
     # Extract album title
     album = release.get('title', 'Unknown Album')
@@ -236,6 +653,8 @@ def extract_metadata_from_result(result: Dict[str, Any]) -> Dict[str, str]:
     release_date = "Unknown"
     release_group = full_release.get('release-group')
     if release_group:
+        # Search hits carry a release group without dates; that stays 'Unknown' rather than
+        # falling back to this pressing's own date, which isn't the first release date
         release_date = release_group.get('first-release-date', 'Unknown')
     else:
         release_date = full_release.get('date', 'Unknown')
@@ -243,9 +662,15 @@ def extract_metadata_from_result(result: Dict[str, Any]) -> Dict[str, str]:
     # Extract MBID
     mbid = release.get('id', '')
     
-    return {
+    metadata = {
         'artist': artist,
         'album': album,
         'release_date': release_date,
         'mbid': mbid
-    }
\ No newline at end of file
+    }
+    if key is not None:
+        with _metadata_cache_lock:
+            _metadata_cache[key] = metadata
+            if len(_metadata_cache) > LOOKUP_CACHE_SIZE:
+                _metadata_cache.popitem(last=False)
+    return metadata
\ No newline at end of file
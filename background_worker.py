@@ -5,17 +5,24 @@ import csv
 from typing import Optional
 from queue_manager import QueueManager
 from rate_limiter import AdaptiveRateLimiter
-from shared_data import shared_data
+from shared_data import shared_data, read_json_lines, append_json_line, tracks_journal_lock
 from async_musicbrainz import (
     RateLimitedMusicBrainz, 
     ServiceUnavailableError, 
     MusicBrainzError,
-    extract_metadata_from_result
+    extract_metadata_from_result,
+    forget_cached_barcode
 )
 from musicbrainz_barcode_lookup import write_release_to_csv, extract_json_path
 import json
 import os
 
+# Buffer size for streaming no_coverart.csv through a rewrite (one large read/write per chunk)
+CSV_STREAM_BUFFER = 1024 * 1024
+
+# The tracks cache is a journal of JSON lines; once it has this many it is rewritten as a single line
+TRACKS_COMPACT_LINES = 1000
+
 class BackgroundWorker:
     """
     Background worker thread that processes barcode lookups from the queue
@@ -40,6 +47,8 @@ class BackgroundWorker:
         self.is_running = False
         self.worker_thread: Optional[threading.Thread] = None
         self.stop_event = threading.Event()
+        # Set by wake() when Flask hands over work, so an idle worker doesn't wait out its sleep
+        self._wake_event = threading.Event()
         
         # Configuration
         self.max_retries = 3
@@ -47,6 +56,29 @@ class BackgroundWorker:
         self.worker_sleep = 1.0  # Sleep between queue checks
         self.cache_update_interval = 5.0  # Update shared data every 5 seconds
         self.last_cache_update = 0
+        
+        # Parsed CSV files by path -> ((mtime_ns, size), rows), so unchanged files aren't reparsed
+        self._csv_cache = {}
+        
+        # Parsed catalog column definitions, with the config file stamp they were read at
+        self._csv_fields = (None, None)
+        
+        # MBID -> barcode index over the parsed catalog rows it was built from
+        self._catalog_by_mbid = (None, {})
+        
+        # Barcodes in catalog.csv, with the file stamp they were read at
+        self._existing_barcodes = None
+        self._existing_barcodes_stamp = None
+        
+        # Track listings cache, with the file stamp it was read at and the number of journal lines
+        self._tracks_cache = None
+        self._tracks_cache_stamp = None
+        self._tracks_cache_lines = 0
+        
+        # Barcodes in no_coverart.csv (with the file stamp they were read at), and rows not yet written
+        self._no_coverart_barcodes = None
+        self._no_coverart_stamp = None
+        self._no_coverart_pending = []
     
     def start(self):
         """Start the background worker thread"""
@@ -68,10 +100,13 @@ class BackgroundWorker:
         print("Stopping background worker...")
         self.is_running = False
         self.stop_event.set()
+        self._wake_event.set()
         
         if self.worker_thread:
             self.worker_thread.join(timeout=10)
         
+        self._flush_no_coverart_csv()
+        self.mb_client.close()
         print("Background worker stopped")
     
     def _worker_loop(self):
@@ -86,13 +121,17 @@ class BackgroundWorker:
                 # Process any new pending barcodes from Flask (linear processing)
                 self._process_pending_barcodes()
                 
+                # Retry cover art downloads requested from the missing cover art page
+                self._process_coverart_retries()
+                
                 # Get next pending barcode from database queue (one at a time)
                 item = self.queue_manager.get_next_pending()
                 
                 if item is None:
-                    # No pending items, update shared data and sleep briefly
+                    # No pending items, update shared data and sleep until woken (or the next heartbeat)
                     self._update_shared_data_if_needed()
-                    time.sleep(self.worker_sleep)
+                    if self._wake_event.wait(timeout=self.worker_sleep):
+                        self._wake_event.clear()
                     continue
                 
                 # Process the item completely before moving to next (linear processing)
@@ -104,28 +143,34 @@ class BackgroundWorker:
             except Exception as e:
                 print(f"Unexpected error in worker loop: {e}")
                 traceback.print_exc()
-                # Don't crash on error, just continue after delay
-                time.sleep(5.0)
+                # Don't crash on error, just continue after delay (cut short by stop())
+                self.stop_event.wait(5.0)
         
         print("Background worker loop finished")
     
+    def wake(self):
+        """Tell an idle worker there are pending barcodes or cover art retries to pick up"""
+        self._wake_event.set()
+    
     def _send_heartbeat(self):
         """Send a lightweight heartbeat to prove worker is alive"""
         try:
             current_time = time.time()
             # Only send heartbeat every 2 seconds to avoid excessive file writes
             if current_time - getattr(self, '_last_heartbeat_time', 0) >= 2.0:
-                from datetime import datetime
-                import os
                 heartbeat_data = {
-                    'last_heartbeat': datetime.now().isoformat(),
                     'worker_pid': os.getpid(),
                     'is_running': self.is_running
                 }
-                shared_data._write_json_file(
-                    shared_data.worker_stats_file.replace('.json', '_heartbeat.json'),
-                    heartbeat_data
-                )
+                if heartbeat_data != getattr(self, '_last_heartbeat_data', None):
+                    # Rewritten only when the state changes; otherwise updating the mtime is enough
+                    shared_data.write_heartbeat(heartbeat_data)
+                    self._last_heartbeat_data = heartbeat_data
+                else:
+                    try:
+                        shared_data.touch_heartbeat()
+                    except FileNotFoundError:
+                        shared_data.write_heartbeat(heartbeat_data)
                 self._last_heartbeat_time = current_time
         except Exception as e:
             print(f"Error sending heartbeat: {e}")
@@ -149,6 +194,7 @@ class BackgroundWorker:
                 else:
                     print(f"Duplicate barcode {barcode} in pending list, skipping")
             
+            to_queue = []
             for barcode in unique_barcodes:
                 try:
                     # Check if already in catalog (using shared data)
@@ -162,26 +208,67 @@ class BackgroundWorker:
                         print(f"Barcode {barcode} already in queue with status: {queue_status['status']}")
                         continue
                     
-                    # Add to database queue
-                    result = self.queue_manager.add_barcode(barcode)
-                    if result['success']:
-                        print(f"Added {barcode} to database queue (position {result['position']})")
-                    else:
-                        print(f"Failed to add {barcode} to queue: {result.get('message', 'Unknown error')}")
+                    to_queue.append(barcode)
                     
                 except Exception as e:
                     print(f"Error processing pending barcode {barcode}: {e}")
                     import traceback
                     traceback.print_exc()
             
+            # Add to database queue, committing the whole batch at once
+            queued = []
+            if to_queue:
+                results = self.queue_manager.add_barcodes(to_queue)
+                for barcode, result in results.items():
+                    if result['success']:
+                        print(f"Added {barcode} to database queue (position {result['position']})")
+                        queued.append(barcode)
+                    else:
+                        print(f"Failed to add {barcode} to queue: {result.get('message', 'Unknown error')}")
+            
             # Clear pending barcodes file after processing
             shared_data.clear_pending_barcodes()
             
+            # A burst of scans is searched for in batches, so processing each one hits the lookup cache
+            if len(queued) > 1:
+                self._prefetch_lookups(queued)
+            
         except Exception as e:
             print(f"Error processing pending barcodes: {e}")
             import traceback
             traceback.print_exc()
     
+    def _process_coverart_retries(self):
+        """Download cover art for albums Flask asked to retry, then drop the found ones from no_coverart.csv"""
+        try:
+            retries = shared_data.get_pending_coverart_retries()
+            if not retries:
+                return
+            
+            print(f"Retrying cover art for {len(retries)} album(s)")
+            try:
+                # An admin asked for these again, so an image already on disk is revalidated
+                # (a 304 keeps it) rather than taken as is
+                downloaded = self.mb_client.download_cover_art_batch(retries, self.coverart_folder, refresh=True)
+            except Exception as e:
+                # Report them failed rather than leaving them pending to be retried every loop
+                print(f"Error downloading cover art retries: {e}")
+                downloaded = dict.fromkeys(retries, False)
+            results = {barcode: 'complete' if success else 'failed' for barcode, success in downloaded.items()}
+            
+            found = {barcode for barcode, status in results.items() if status == 'complete'}
+            if found:
+                # One rewrite of no_coverart.csv for the whole batch
+                self._remove_from_no_coverart_csv(found)
+                for barcode in found:
+                    shared_data.remove_no_coverart(barcode)
+                shared_data.invalidate_coverart_cache()
+            shared_data.set_coverart_retry_status(results)
+            
+        except Exception as e:
+            print(f"Error processing cover art retries: {e}")
+            traceback.print_exc()
+    
     def _update_shared_data_if_needed(self):
         """Update shared data files periodically"""
         current_time = time.time()
@@ -192,6 +279,9 @@ class BackgroundWorker:
     def _update_shared_data(self):
         """Update all shared data files for Flask to read"""
         try:
+            # Write out albums found without cover art since the last update
+            self._flush_no_coverart_csv()
+            
             # Update catalog cache
             catalog_data = self._load_catalog_from_csv()
             shared_data.update_catalog_cache(catalog_data)
@@ -211,18 +301,36 @@ class BackgroundWorker:
         except Exception as e:
             print(f"Error updating shared data: {e}")
     
+    def _load_csv_rows(self, path: str, description: str) -> list:
+        """
+        Load a CSV file as a list of row dicts, reparsing it only when its mtime or size changes.
+        The returned list is shared between calls, so don't modify it.
+        """
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            print(f"Error loading {description} from CSV: {e}")
+            return []
+        
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._csv_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+        except Exception as e:
+            print(f"Error loading {description} from CSV: {e}")
+            return []
+        self._csv_cache[path] = (stamp, rows)
+        return rows
+    
     def _load_catalog_from_csv(self):
         """Load catalog data from CSV file"""
-        catalog_data = []
-        if os.path.exists(self.catalog_file):
-            try:
-                import csv
-                with open(self.catalog_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    catalog_data = list(reader)
-            except Exception as e:
-                print(f"Error loading catalog from CSV: {e}")
-        return catalog_data
+        return self._load_csv_rows(self.catalog_file, 'catalog')
     
     def _get_all_queue_items(self):
         """Get all items from database queue"""
@@ -236,25 +344,20 @@ class BackgroundWorker:
     
     def _load_no_coverart_from_csv(self):
         """Load no cover art data from CSV file"""
-        no_coverart_data = []
-        if os.path.exists(self.no_coverart_file):
-            try:
-                import csv
-                with open(self.no_coverart_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    no_coverart_data = list(reader)
-            except Exception as e:
-                print(f"Error loading no cover art from CSV: {e}")
-        return no_coverart_data
+        return self._load_csv_rows(self.no_coverart_file, 'no cover art')
     
     def _get_canonical_barcode_from_catalog(self, mbid: str) -> str:
         """Get the canonical barcode from the catalog using the MBID"""
         try:
             catalog_data = self._load_catalog_from_csv()
-            for item in catalog_data:
-                if item.get('MusicBrainz ID') == mbid:
-                    return item.get('Barcode')
-            return None
+            rows, by_mbid = self._catalog_by_mbid
+            if rows is not catalog_data:
+                # The parsed catalog changed, so rebuild the index (first row wins, as a scan would)
+                by_mbid = {}
+                for item in catalog_data:
+                    by_mbid.setdefault(item.get('MusicBrainz ID'), item.get('Barcode'))
+                self._catalog_by_mbid = (catalog_data, by_mbid)
+            return by_mbid.get(mbid)
         except Exception as e:
             print(f"Error getting canonical barcode: {e}")
             return None
@@ -266,6 +369,9 @@ class BackgroundWorker:
         
         print(f"Processing barcode: {barcode} (attempt {retry_count + 1})")
         
+        # Completed steps and metadata, written together with the final status in one update
+        updates = {}
+        
         try:
             # Mark as processing
             self.queue_manager.update_status(barcode, 'processing')
@@ -274,23 +380,25 @@ class BackgroundWorker:
             if not item.get('metadata_complete', False):
                 result = self._lookup_metadata(barcode)
                 if result is None:
-                    self.queue_manager.update_status(barcode, 'failed', 'No album found for barcode')
+                    self.queue_manager.apply_updates(barcode, status='failed', error_message='No album found for barcode')
                     return
                 
-                # Write to catalog CSV
+                # Write to catalog CSV (write_release_to_csv adds the barcode to the set)
                 existing_barcodes = self._load_existing_barcodes()
-                write_release_to_csv(result, self.catalog_file, existing_barcodes, self.config_file)
+                stamp = self._existing_barcodes_stamp
+                write_release_to_csv(result, self.catalog_file, existing_barcodes, self.config_file,
+                                     fields=self._load_csv_fields())
+                self._after_catalog_write(stamp)
                 
                 # Extract and store metadata
                 metadata = extract_metadata_from_result(result)
-                self.queue_manager.mark_processing_step_complete(barcode, 'metadata', metadata)
+                self._step_complete(updates, 'metadata', metadata)
                 
                 print(f"Metadata lookup complete for {barcode}: {metadata.get('artist')} - {metadata.get('album')}")
             
-            # Always reload item to get latest metadata from database
-            item = self.queue_manager.get_barcode_status(barcode)
-            if not item:
-                return
+            # Only this worker changes the item while it is processing, so apply the step's results
+            # locally instead of reading them back from the database
+            item = dict(item, **updates)
             
             # Step 2: Download cover art if not already complete
             if not item.get('coverart_complete', False):
@@ -314,7 +422,7 @@ class BackgroundWorker:
                             print(f"[WORKER] Cover art already exists: {expected_path} (size: {file_size} bytes)")
                             if file_size > 0:
                                 print(f"[WORKER] Existing cover art is valid, marking step complete")
-                                self.queue_manager.mark_processing_step_complete(barcode, 'coverart')
+                                self._step_complete(updates, 'coverart')
                                 print(f"[WORKER] Cover art step completed for {barcode} (existing file)")
                                 file_already_exists = True
                             else:
@@ -323,7 +431,10 @@ class BackgroundWorker:
                         success = True  # Default to success if file already exists
                         if not file_already_exists:
                             print(f"[WORKER] Calling download_cover_art for {canonical_barcode}")
-                            success = self.mb_client.download_cover_art(mbid, canonical_barcode, self.coverart_folder)
+                            download = self.mb_client.download_cover_art_async(mbid, canonical_barcode, self.coverart_folder)
+                            # Cover art comes from a different host, so fetch the track listing while it downloads
+                            self._prefetch_tracks(item)
+                            success = download.result()
                             print(f"[WORKER] Download result for {barcode}: {success}")
                         
                         if success and not file_already_exists:
@@ -332,7 +443,7 @@ class BackgroundWorker:
                                 final_size = os.path.getsize(expected_path)
                                 print(f"[WORKER] Verification: cover art file exists with size {final_size} bytes")
                                 if final_size > 0:
-                                    self.queue_manager.mark_processing_step_complete(barcode, 'coverart')
+                                    self._step_complete(updates, 'coverart')
                                     print(f"[WORKER SUCCESS] Cover art download complete for {barcode}")
                                 else:
                                     print(f"[WORKER ERROR] Cover art file is empty after download: {expected_path}")
@@ -346,7 +457,7 @@ class BackgroundWorker:
                         
                         # Mark step complete regardless of success to prevent getting stuck (only if not already marked)
                         if not item.get('coverart_complete', False) and not file_already_exists:
-                            self.queue_manager.mark_processing_step_complete(barcode, 'coverart')
+                            self._step_complete(updates, 'coverart')
                             print(f"[WORKER] Cover art step marked complete for {barcode}")
                             
                     except Exception as e:
@@ -355,13 +466,13 @@ class BackgroundWorker:
                         traceback.print_exc()
                         coverart_failed = True
                         # Mark as complete even on error to prevent stuck processing
-                        self.queue_manager.mark_processing_step_complete(barcode, 'coverart')
+                        self._step_complete(updates, 'coverart')
                         print(f"[WORKER] Cover art step marked complete after error for {barcode}")
                 else:
                     print(f"[WORKER] No MBID available for cover art download for {barcode}, marking as complete")
                     coverart_failed = True
                     # Mark as complete even without MBID to prevent getting stuck
-                    self.queue_manager.mark_processing_step_complete(barcode, 'coverart')
+                    self._step_complete(updates, 'coverart')
                 
                 # If cover art failed, append to no_coverart.csv
                 if coverart_failed:
@@ -372,10 +483,7 @@ class BackgroundWorker:
             else:
                 print(f"[WORKER] Skipping cover art for {barcode}: already complete")
             
-            # Reload item again to ensure we have the latest state after cover art processing
-            item = self.queue_manager.get_barcode_status(barcode)
-            if not item:
-                return
+            item.update(updates)
             
             # Step 3: Get track listing if not already complete
             if not item.get('tracks_complete', False):
@@ -389,48 +497,99 @@ class BackgroundWorker:
                     print(f"No MBID available for track listing for {barcode}")
                 
                 # Always mark tracks step as complete regardless of whether tracks were found
-                self.queue_manager.mark_processing_step_complete(barcode, 'tracks')
+                self._step_complete(updates, 'tracks')
             
             # Mark as complete
-            self.queue_manager.update_status(barcode, 'complete')
+            self.queue_manager.apply_updates(barcode, status='complete', error_message=None, **updates)
             print(f"Successfully completed processing for {barcode}")
             
+        # Errors keep the steps that did finish, so a retry picks up where this attempt stopped
         except ServiceUnavailableError as e:
             # 503 error - increase retry count and possibly retry
-            self.queue_manager.increment_retry_count(barcode)
-            
             if retry_count + 1 >= self.max_retries:
-                self.queue_manager.update_status(barcode, 'failed', f"Max retries exceeded: {e}")
+                self.queue_manager.apply_updates(barcode, status='failed', error_message=f"Max retries exceeded: {e}",
+                                                 retry_count=retry_count + 1, **updates)
                 print(f"Max retries exceeded for {barcode}: {e}")
             else:
-                self.queue_manager.update_status(barcode, 'pending')
+                self.queue_manager.apply_updates(barcode, status='pending', error_message=None,
+                                                 retry_count=retry_count + 1, **updates)
                 print(f"503 error for {barcode}, will retry (attempt {retry_count + 1})")
                 
-                # Additional delay for retries
-                time.sleep(self.retry_delay * (retry_count + 1))
+                # Additional delay for retries (cut short by stop())
+                self.stop_event.wait(self.retry_delay * (retry_count + 1))
         
         except MusicBrainzError as e:
             # Other MusicBrainz API errors
-            self.queue_manager.increment_retry_count(barcode)
-            
             if retry_count + 1 >= self.max_retries:
-                self.queue_manager.update_status(barcode, 'failed', str(e))
+                self.queue_manager.apply_updates(barcode, status='failed', error_message=str(e),
+                                                 retry_count=retry_count + 1, **updates)
                 print(f"MusicBrainz error for {barcode} (max retries exceeded): {e}")
             else:
-                self.queue_manager.update_status(barcode, 'pending')
+                self.queue_manager.apply_updates(barcode, status='pending', error_message=None,
+                                                 retry_count=retry_count + 1, **updates)
                 print(f"MusicBrainz error for {barcode}, will retry: {e}")
-                time.sleep(self.retry_delay)
+                self.stop_event.wait(self.retry_delay)
         
         except Exception as e:
             # Unexpected errors
             error_msg = f"Unexpected error: {e}"
-            self.queue_manager.update_status(barcode, 'failed', error_msg)
+            self.queue_manager.apply_updates(barcode, status='failed', error_message=error_msg, **updates)
             print(f"Unexpected error processing {barcode}: {e}")
             traceback.print_exc()
     
+    def _step_complete(self, updates: dict, step: str, metadata: dict = None):
+        """Record a finished processing step (and any metadata) in an item's pending updates"""
+        updates[f"{step}_complete"] = True
+        if metadata:
+            for field in ['artist', 'album', 'release_date', 'mbid']:
+                if field in metadata:
+                    updates[field] = metadata[field]
+    
     def _lookup_metadata(self, barcode: str):
         """Lookup metadata for a barcode"""
-        return self.mb_client.lookup_by_barcode(barcode)
+        return self.mb_client.lookup_by_barcode(barcode, need_release_group=self._config_needs_full_release())
+    
+    def _prefetch_lookups(self, barcodes: list):
+        """Look up newly queued barcodes in batched searches to warm the client's lookup cache
+        (any the batch misses are searched for individually when they are processed)"""
+        try:
+            self.mb_client.lookup_by_barcodes(barcodes, need_release_group=self._config_needs_full_release())
+        except Exception as e:
+            # Not fatal: each barcode is still looked up on its own when it is processed
+            print(f"Error prefetching lookups for {len(barcodes)} barcodes: {e}")
+    
+    def _load_csv_fields(self) -> Optional[list]:
+        """Catalog column definitions from the config file, reparsed only when it changes (None if unreadable)"""
+        try:
+            st = os.stat(self.config_file)
+        except OSError:
+            return None
+        
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self._csv_fields[0]:
+            try:
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    self._csv_fields = (stamp, json.load(f))
+            except (IOError, ValueError):
+                return None
+        return self._csv_fields[1]
+    
+    def _config_needs_full_release(self) -> bool:
+        """Check whether any catalog column is read from the full release (e.g. First Release)"""
+        fields = self._load_csv_fields()
+        if fields is None:
+            return True  # Can't tell, so fetch it
+        return any(field.get('path', '').startswith('full_release') for field in fields)
+    
+    def _prefetch_tracks(self, item: dict):
+        """Fetch and cache an item's track listing ahead of the tracks step"""
+        if item.get('tracks_complete', False) or not item.get('mbid'):
+            return
+        try:
+            self._get_and_cache_tracks(item['barcode'], item['mbid'])
+        except Exception as e:
+            # The tracks step fetches it again and handles the error properly
+            print(f"Could not prefetch track listing for {item['barcode']}: {e}")
     
     def _get_and_cache_tracks(self, barcode: str, mbid: str):
         """Get track listing and cache it"""
@@ -447,51 +606,125 @@ class BackgroundWorker:
         if tracks:
             # Cache the result
             tracks_cache[barcode] = tracks
-            self._save_tracks_cache(tracks_cache)
+            self._save_tracks_entry(barcode, tracks)
         
         return tracks or []
     
+    def _tracks_file_stamp(self):
+        """(mtime_ns, size) of the tracks cache file, or None if it doesn't exist"""
+        try:
+            st = os.stat(self.tracks_cache_file)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
     def _load_tracks_cache(self) -> dict:
-        """Load track listings cache from disk"""
-        if os.path.exists(self.tracks_cache_file):
+        """Load track listings cache from disk, rereading it only when someone else changed it"""
+        stamp = self._tracks_file_stamp()
+        if self._tracks_cache is not None and stamp == self._tracks_cache_stamp:
+            return self._tracks_cache
+        
+        cache = {}
+        lines = 0
+        if stamp is not None:
             try:
-                with open(self.tracks_cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return {}
-        return {}
-    
-    def _save_tracks_cache(self, cache: dict):
-        """Save track listings cache to disk"""
+                cache = read_json_lines(self.tracks_cache_file)
+                with open(self.tracks_cache_file, 'rb') as f:
+                    lines = sum(1 for line in f if line.strip())
+            except (ValueError, IOError):
+                cache = {}
+        self._tracks_cache = cache
+        self._tracks_cache_stamp = stamp
+        self._tracks_cache_lines = lines
+        return cache
+    
+    def _save_tracks_entry(self, barcode: str, tracks: list):
+        """Append one track listing to the cache file, compacting it when the journal gets long"""
         try:
-            with open(self.tracks_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache, f, indent=2, ensure_ascii=False)
+            with tracks_journal_lock:
+                before = self._tracks_file_stamp()
+                append_json_line(self.tracks_cache_file, {barcode: tracks})
+                if before == self._tracks_cache_stamp:
+                    self._tracks_cache_stamp = self._tracks_file_stamp()
+            self._tracks_cache_lines += 1
         except IOError as e:
             print(f"Error saving tracks cache: {e}")
+            return
+        
+        if self._tracks_cache_lines >= TRACKS_COMPACT_LINES:
+            self._compact_tracks_cache()
+    
+    def _compact_tracks_cache(self):
+        """Rewrite the tracks cache journal as a single line"""
+        try:
+            # Flask appends under the same lock, so nothing it writes can land in the file being replaced
+            with tracks_journal_lock:
+                # Start from the file itself so listings Flask appended are kept
+                size = os.path.getsize(self.tracks_cache_file)
+                cache = read_json_lines(self.tracks_cache_file)
+                tmp_file = self.tracks_cache_file + '.tmp'
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(cache, f, ensure_ascii=False, separators=(',', ':'))
+                    # Pick up anything appended (e.g. by another process) since the file was read
+                    if os.path.getsize(self.tracks_cache_file) > size:
+                        appended = read_json_lines(self.tracks_cache_file, offset=size)
+                        cache.update(appended)
+                        f.write('\n' + json.dumps(appended, ensure_ascii=False, separators=(',', ':')))
+                os.replace(tmp_file, self.tracks_cache_file)
+                self._tracks_cache_stamp = self._tracks_file_stamp()
+            self._tracks_cache = cache
+            self._tracks_cache_lines = 1
+            print(f"Compacted tracks cache ({len(cache)} albums)")
+        except (ValueError, IOError) as e:
+            print(f"Error compacting tracks cache: {e}")
     
     def _append_to_no_coverart_csv(self, barcode: str, artist: str, album: str):
-        """Append album without cover art to no_coverart.csv"""
+        """Queue an album without cover art to be appended to no_coverart.csv"""
         try:
-            print(f"[NO COVER ART] Attempting to add {barcode} to {self.no_coverart_file}")
-            print(f"[NO COVER ART] Album: {artist} - {album}")
+            if barcode in self._load_no_coverart_barcodes():
+                print(f"[NO COVER ART] {barcode} already exists in no_coverart.csv, skipping")
+                return
             
-            # Check if already in the file to avoid duplicates
-            existing_barcodes = set()
-            if os.path.exists(self.no_coverart_file):
+            # Written in batches by _flush_no_coverart_csv (at the next shared data update)
+            self._no_coverart_barcodes.add(barcode)
+            self._no_coverart_pending.append([barcode, artist, album])
+            print(f"[NO COVER ART] Queued {barcode} for no_coverart.csv: {artist} - {album}")
+        except Exception as e:
+            print(f"[NO COVER ART ERROR] Unexpected error queueing {barcode} for no_coverart.csv: {e}")
+            traceback.print_exc()
+    
+    def _load_no_coverart_barcodes(self) -> set:
+        """Barcodes listed in no_coverart.csv (or queued for it), rereading the file only when it changes"""
+        try:
+            st = os.stat(self.no_coverart_file)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        
+        if self._no_coverart_barcodes is None or stamp != self._no_coverart_stamp:
+            barcodes = set()
+            if stamp is not None:
                 try:
-                    with open(self.no_coverart_file, 'r', encoding='utf-8') as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            if row.get('Barcode'):
-                                existing_barcodes.add(row['Barcode'])
-                    print(f"[NO COVER ART] Found {len(existing_barcodes)} existing entries")
+                    with open(self.no_coverart_file, 'r', newline='', encoding='utf-8', buffering=CSV_STREAM_BUFFER) as f:
+                        reader = csv.reader(f)
+                        header = next(reader, None) or []
+                        idx = header.index('Barcode') if 'Barcode' in header else 0
+                        barcodes = {row[idx] for row in reader if len(row) > idx}
                 except Exception as e:
                     print(f"[NO COVER ART] Error reading existing file: {e}")
-            
-            if barcode in existing_barcodes:
-                print(f"[NO COVER ART] {barcode} already exists in no_coverart.csv, skipping")
-                return
-            
+            # Anything still waiting to be written counts as listed
+            barcodes.update(row[0] for row in self._no_coverart_pending)
+            self._no_coverart_barcodes = barcodes
+            self._no_coverart_stamp = stamp
+        return self._no_coverart_barcodes
+    
+    def _flush_no_coverart_csv(self):
+        """Append all queued albums without cover art to no_coverart.csv in one write"""
+        if not self._no_coverart_pending:
+            return
+        
+        pending, self._no_coverart_pending = self._no_coverart_pending, []
+        try:
             file_exists = os.path.exists(self.no_coverart_file)
             
             with open(self.no_coverart_file, 'a', newline='', encoding='utf-8') as f:
@@ -502,35 +735,93 @@ class BackgroundWorker:
                     writer.writerow(['Barcode', 'Artist', 'Album'])
                     print(f"[NO COVER ART] Created new file with header: {self.no_coverart_file}")
                 
-                # Write the album data
-                writer.writerow([barcode, artist, album])
-                print(f"[NO COVER ART SUCCESS] Added {barcode} to no_coverart.csv: {artist} - {album}")
+                writer.writerows(pending)
+            
+            # Our own write, so the known barcodes are still current
+            st = os.stat(self.no_coverart_file)
+            self._no_coverart_stamp = (st.st_mtime_ns, st.st_size)
+            print(f"[NO COVER ART SUCCESS] Added {len(pending)} album(s) to no_coverart.csv")
                 
         except IOError as e:
+            # Keep them queued for the next flush
+            self._no_coverart_pending = pending + self._no_coverart_pending
             print(f"[NO COVER ART ERROR] IO error writing to no_coverart.csv: {e}")
-            import traceback
             traceback.print_exc()
+    
+    def _remove_from_no_coverart_csv(self, barcodes: set):
+        """Remove a set of barcodes from no_coverart.csv in one streamed pass"""
+        self._flush_no_coverart_csv()
+        if not os.path.exists(self.no_coverart_file):
+            return
+        
+        try:
+            # Stream the kept rows into a temp file, then swap it in atomically
+            tmp_file = self.no_coverart_file + '.tmp'
+            removed = 0
+            with open(self.no_coverart_file, 'r', newline='', encoding='utf-8', buffering=CSV_STREAM_BUFFER) as fin, \
+                 open(tmp_file, 'w', newline='', encoding='utf-8', buffering=CSV_STREAM_BUFFER) as fout:
+                reader = csv.reader(fin)
+                header = next(reader, None) or ['Barcode', 'Artist', 'Album']
+                idx = header.index('Barcode') if 'Barcode' in header else 0
+                writer = csv.writer(fout)
+                writer.writerow(header)
+                for row in reader:
+                    if len(row) > idx and row[idx] in barcodes:
+                        removed += 1
+                        continue
+                    writer.writerow(row)
+            
+            # Leave the file untouched if none of the barcodes were listed
+            if removed:
+                os.replace(tmp_file, self.no_coverart_file)
+                print(f"[NO COVER ART] Removed {removed} album(s) from no_coverart.csv")
+            else:
+                os.remove(tmp_file)
         except Exception as e:
-            print(f"[NO COVER ART ERROR] Unexpected error writing to no_coverart.csv: {e}")
-            import traceback
-            traceback.print_exc()
+            print(f"[NO COVER ART ERROR] Error removing {sorted(barcodes)} from no_coverart.csv: {e}")
     
     def _load_existing_barcodes(self) -> set:
-        """Load existing barcodes from catalog to prevent duplicates"""
+        """Load existing barcodes from catalog to prevent duplicates (rescanned only when the file changes)"""
+        try:
+            st = os.stat(self.catalog_file)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        if self._existing_barcodes is not None and stamp == self._existing_barcodes_stamp:
+            return self._existing_barcodes
+        
         existing_barcodes = set()
-        if os.path.exists(self.catalog_file):
+        if stamp is not None:
             try:
-                import csv
                 with open(self.catalog_file, newline='', encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        barcode = row.get("Barcode")
-                        if barcode:
-                            existing_barcodes.add(barcode)
+                    # Only the Barcode column is needed, so skip building a dict per row
+                    reader = csv.reader(f)
+                    header = next(reader, None) or []
+                    if 'Barcode' in header:
+                        idx = header.index('Barcode')
+                        existing_barcodes = {row[idx] for row in reader if len(row) > idx and row[idx]}
             except Exception as e:
                 print(f"Error loading existing barcodes: {e}")
+        self._existing_barcodes = existing_barcodes
+        self._existing_barcodes_stamp = stamp
         return existing_barcodes
     
+    def _after_catalog_write(self, stamp_before):
+        """Keep the existing barcode set after our own catalog append, rather than rescanning the file"""
+        try:
+            st = os.stat(self.catalog_file)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        
+        if stamp != stamp_before:
+            # The row was appended and its barcode is already in the set
+            self._existing_barcodes_stamp = stamp
+        else:
+            # Nothing reached the catalog (e.g. written to incomplete.csv), but the set may have
+            # gained the barcode anyway, so rescan next time
+            self._existing_barcodes = None
+    
     def get_status(self) -> dict:
         """Get worker status information including queue statistics"""
         try:
@@ -561,18 +852,36 @@ class BackgroundWorker:
 
 # Global worker instance
 _worker_instance: Optional[BackgroundWorker] = None
+_worker_instance_lock = threading.Lock()
 
 def get_worker() -> BackgroundWorker:
     """Get the global worker instance (lazy initialization)"""
     global _worker_instance
     if _worker_instance is None:
-        try:
-            _worker_instance = BackgroundWorker()
-        except Exception as e:
-            print(f"Failed to initialize background worker: {e}")
-            raise
+        # The worker may be created from the startup thread and a request at the same time
+        with _worker_instance_lock:
+            if _worker_instance is None:
+                try:
+                    _worker_instance = BackgroundWorker()
+                except Exception as e:
+                    print(f"Failed to initialize background worker: {e}")
+                    raise
     return _worker_instance
 
+def wake_worker():
+    """Wake the global worker if it is running (no-op otherwise; it picks up pending work when it starts)"""
+    worker = _worker_instance
+    if worker is not None:
+        worker.wake()
+
+def forget_cached_lookup(barcode: str):
+    """Make the next lookup of a barcode ask MusicBrainz again (an admin retry may follow a correction there)"""
+    worker = _worker_instance
+    if worker is not None:
+        worker.mb_client.forget_barcode(barcode)
+    else:
+        forget_cached_barcode(barcode)
+
 def start_worker():
     """Start the global worker"""
     worker = get_worker()
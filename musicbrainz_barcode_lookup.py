@@ -95,19 +95,21 @@ def extract_json_path(data, path):
             return None
     return data
 
-def write_release_to_csv(result, csv_file, existing_barcodes=None, config_file="csv_fields.json", incomplete_file="incomplete.csv"):
+def write_release_to_csv(result, csv_file, existing_barcodes=None, config_file="csv_fields.json", incomplete_file="incomplete.csv", fields=None):
     """
     Append release info to a CSV file using field definitions from a config file.
     If required fields (artist or album) are missing, write to incomplete_file instead.
     Deduplicates by barcode if existing_barcodes is provided.
+    Callers writing many releases can pass the already parsed field definitions as fields.
     """
     if not result:
         print("No release data to write.")
         return
 
     # Load config
-    with open(config_file, "r") as f:
-        fields = json.load(f)
+    if fields is None:
+        with open(config_file, "r") as f:
+            fields = json.load(f)
 
     # Prepare row and check for missing artist/album
     row = []
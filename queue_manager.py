@@ -123,6 +123,47 @@ class QueueManager:
             print(f"Error adding barcode {barcode}: {e}")
             raise
     
+    def add_barcodes(self, barcodes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Add several barcodes to the processing queue in one transaction (one commit for the batch).
+        Returns barcode -> result like add_barcode's (without the current status of ones already queued).
+        """
+        results = {}
+        try:
+            with self._get_connection() as conn:
+                conn.execute('BEGIN')
+                try:
+                    pending = conn.execute(
+                        "SELECT COUNT(*) AS pending FROM barcode_queue WHERE status = 'pending'"
+                    ).fetchone()['pending']
+                    
+                    for barcode in barcodes:
+                        cursor = conn.execute(
+                            'INSERT OR IGNORE INTO barcode_queue (barcode) VALUES (?)',
+                            (barcode,)
+                        )
+                        if cursor.rowcount:
+                            pending += 1
+                            results[barcode] = {
+                                'success': True,
+                                'id': cursor.lastrowid,
+                                'status': 'pending',
+                                'position': pending
+                            }
+                        else:
+                            results[barcode] = {
+                                'success': False,
+                                'message': 'Barcode already in queue'
+                            }
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
+            return results
+        except Exception as e:
+            print(f"Error adding {len(barcodes)} barcodes: {e}")
+            raise
+    
     def get_next_pending(self) -> Optional[Dict[str, Any]]:
         """Get the next pending barcode for processing"""
         with self._get_connection() as conn:
@@ -174,6 +215,28 @@ class QueueManager:
             
             conn.execute(query, params)
     
+    def apply_updates(self, barcode: str, **fields):
+        """Update several columns of a queued barcode in one statement (e.g. status plus completed steps)"""
+        valid_fields = ['status', 'error_message', 'retry_count',
+                        'metadata_complete', 'coverart_complete', 'tracks_complete',
+                        'artist', 'album', 'release_date', 'mbid']
+        invalid = [field for field in fields if field not in valid_fields]
+        if invalid:
+            raise ValueError(f"Invalid fields: {invalid}. Must be in {valid_fields}")
+        
+        with self._get_connection() as conn:
+            updates = [f"{field} = ?" for field in fields]
+            params = list(fields.values())
+            params.append(barcode)
+            
+            query = f'''
+                UPDATE barcode_queue 
+                SET {', '.join(updates + ['last_attempt = CURRENT_TIMESTAMP'])}
+                WHERE barcode = ?
+            '''
+            
+            conn.execute(query, params)
+    
     def increment_retry_count(self, barcode: str):
         """Increment the retry count for a barcode"""
         with self._get_connection() as conn:
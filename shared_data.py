@@ -6,8 +6,9 @@ Only the background worker touches the database - Flask reads from these files.
 import json
 import os
 import threading
+import time
 from typing import Dict, List, Any, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 
 class SharedDataManager:
     """Manages shared data files that allow Flask to avoid database access"""
@@ -24,8 +25,36 @@ class SharedDataManager:
         self.catalog_cache_file = os.path.join(data_dir, 'catalog_cache.json')
         self.queue_status_file = os.path.join(data_dir, 'queue_status.json')
         self.worker_stats_file = os.path.join(data_dir, 'worker_stats.json')
+        self.heartbeat_file = os.path.join(data_dir, 'worker_stats_heartbeat.json')
         self.no_coverart_cache_file = os.path.join(data_dir, 'no_coverart_cache.json')
         self.scan_metadata_file = os.path.join(data_dir, 'scan_metadata.json')
+        self.coverart_retry_file = os.path.join(data_dir, 'coverart_retries.json')
+        
+        # Finished cover art retries are kept this long for the page polling them, then dropped (seconds)
+        self.coverart_retry_ttl = 3600
+        
+        # Cover art folder served by Flask, listed once and re-scanned when it changes
+        self.coverart_folder = os.path.join('static', 'coverart')
+        self._coverart_cache = {'mtime': None, 'barcodes': set(), 'version': 0, 'checked': 0.0}
+        
+        # How long a cover art listing is trusted before the folder is stat'ed again (seconds)
+        self.coverart_recheck_seconds = 5
+        
+        # Immutable catalog snapshot (rows plus a barcode index). Readers use it lock-free;
+        # the worker swaps in a new one whenever it rebuilds the catalog.
+        self._catalog_snapshot = None
+        
+        # Parsed copies of the JSON files Flask polls, keyed by path and re-read only when
+        # the file's (mtime, size) stamp changes
+        self._json_file_cache = {}
+        # Bumped every time a path's cached data is replaced, for ETags
+        self._json_file_versions = {}
+        
+        # Last payload the worker wrote to each periodically refreshed file
+        self._last_published = {}
+        
+        # Failed queue items, derived from the parsed queue status it was filtered from
+        self._failed_items = (None, [])
         
         # Grace period for catalog rebuilds (seconds)
         self.catalog_rebuild_grace_period = 30
@@ -64,43 +93,123 @@ class SharedDataManager:
         except Exception as e:
             print(f"Error clearing pending barcodes: {e}")
     
+    def add_coverart_retry(self, barcode: str, mbid: str) -> bool:
+        """Ask the worker to retry a cover art download (Flask -> Worker communication)"""
+        try:
+            with self.lock:
+                retries = self._prune_coverart_retries(self._read_json_file(self.coverart_retry_file) or {})
+                retries[barcode] = {'mbid': mbid, 'status': 'pending', 'updated': self.get_current_timestamp()}
+                self._write_json_file(self.coverart_retry_file, retries)
+            return True
+        except Exception as e:
+            print(f"Error adding cover art retry for {barcode}: {e}")
+            return False
+    
+    def get_pending_coverart_retries(self) -> Dict[str, str]:
+        """Get barcode -> MBID for cover art retries waiting to be processed (Worker reads this)"""
+        # Polled every worker loop, so only reparsed when Flask (or the worker) has rewritten the file
+        retries = self._read_json_file_cached(self.coverart_retry_file) or {}
+        return {barcode: retry['mbid'] for barcode, retry in retries.items() if retry.get('status') == 'pending'}
+    
+    def set_coverart_retry_status(self, results: Dict[str, str]):
+        """Record the outcome of processed cover art retries (Worker only)"""
+        try:
+            with self.lock:
+                retries = self._prune_coverart_retries(self._read_json_file(self.coverart_retry_file) or {})
+                timestamp = self.get_current_timestamp()
+                for barcode, status in results.items():
+                    if barcode in retries:
+                        retries[barcode]['status'] = status
+                        retries[barcode]['updated'] = timestamp
+                self._write_json_file(self.coverart_retry_file, retries)
+        except Exception as e:
+            print(f"Error updating cover art retry status: {e}")
+    
+    def get_coverart_retry_status(self, barcode: str) -> Optional[Dict[str, str]]:
+        """Get the state of a cover art retry: pending, complete or failed (Flask reads this)"""
+        retries = self._read_json_file_cached(self.coverart_retry_file) or {}
+        return retries.get(barcode)
+    
+    def _prune_coverart_retries(self, retries: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop finished cover art retries last updated more than coverart_retry_ttl seconds ago"""
+        cutoff = datetime.now() - timedelta(seconds=self.coverart_retry_ttl)
+        kept = {}
+        for barcode, retry in retries.items():
+            if retry.get('status') != 'pending':
+                try:
+                    if datetime.fromisoformat(retry.get('updated', '')) < cutoff:
+                        continue
+                except (TypeError, ValueError):
+                    continue  # No usable timestamp, so it can't be waited on either
+            kept[barcode] = retry
+        return kept
+    
     def update_catalog_cache(self, catalog_data: List[Dict[str, Any]]):
         """Update catalog cache (Worker only)"""
         try:
+            # Nothing to do if the rebuilt catalog is identical to what readers already see
+            snapshot = self._catalog_snapshot
+            if (snapshot is not None and snapshot['catalog'] == catalog_data
+                    and os.path.exists(self.catalog_cache_file)):
+                return
+            
             cache_data = {
                 'last_updated': datetime.now().isoformat(),
                 'catalog': catalog_data
             }
             self._write_json_file(self.catalog_cache_file, cache_data)
+            self._swap_catalog_snapshot(catalog_data)
         except Exception as e:
             print(f"Error updating catalog cache: {e}")
     
     def get_catalog_cache(self) -> List[Dict[str, Any]]:
         """Get catalog data (Flask reads this)"""
-        try:
-            data = self._read_json_file(self.catalog_cache_file)
-            return data.get('catalog', []) if data else []
-        except Exception as e:
-            print(f"Error reading catalog cache: {e}")
-            return []
+        return self._load_catalog()['catalog']
+    
+    def _load_catalog(self) -> Dict[str, Any]:
+        """Get the current catalog snapshot, reading the cache file only the first time"""
+        snapshot = self._catalog_snapshot
+        if snapshot is not None:
+            return snapshot
+        
+        with self.lock:
+            if self._catalog_snapshot is None:
+                try:
+                    data = self._read_json_file(self.catalog_cache_file)
+                    catalog = data.get('catalog', []) if data else []
+                except Exception as e:
+                    print(f"Error reading catalog cache: {e}")
+                    catalog = []
+                self._swap_catalog_snapshot(catalog)
+            return self._catalog_snapshot
+    
+    def _swap_catalog_snapshot(self, catalog: List[Dict[str, Any]]):
+        """Build a new catalog snapshot and publish it with a single assignment"""
+        # First occurrence wins, matching the old linear scans
+        by_barcode = {}
+        for item in catalog:
+            by_barcode.setdefault(item.get('Barcode'), item)
+        
+        previous = self._catalog_snapshot
+        self._catalog_snapshot = {
+            'version': previous['version'] + 1 if previous else 1,
+            'catalog': catalog,
+            'by_barcode': by_barcode
+        }
     
     def update_queue_status(self, queue_data: List[Dict[str, Any]]):
         """Update queue status cache (Worker only)"""
         try:
             # Convert to dict with barcode as key for fast lookups
             queue_dict = {item['barcode']: item for item in queue_data}
-            cache_data = {
-                'last_updated': datetime.now().isoformat(),
-                'queue': queue_dict
-            }
-            self._write_json_file(self.queue_status_file, cache_data)
+            self._publish_json_file(self.queue_status_file, 'queue', queue_dict)
         except Exception as e:
             print(f"Error updating queue status: {e}")
     
     def get_queue_status(self, barcode: str = None) -> Optional[Dict[str, Any]]:
         """Get queue status for specific barcode or all (Flask reads this)"""
         try:
-            data = self._read_json_file(self.queue_status_file)
+            data = self._read_json_file_cached(self.queue_status_file)
             if not data:
                 return None
                 
@@ -114,6 +223,21 @@ class SharedDataManager:
             print(f"Error reading queue status: {e}")
             return None
     
+    def get_failed_items(self) -> List[Dict[str, Any]]:
+        """Get queue items whose status is 'failed', filtered once per queue status update (Flask reads this)"""
+        return self.get_failed_items_and_version()[0]
+    
+    def get_failed_items_and_version(self):
+        """Get (failed items, queue status version), read together so an ETag built on the version matches the items"""
+        data, version = self._read_json_file_versioned(self.queue_status_file)
+        queue_data = data.get('queue', {}) if data else None
+        cached = self._failed_items
+        if cached[0] is not queue_data:
+            failed = [item for item in (queue_data or {}).values() if item.get('status') == 'failed']
+            cached = (queue_data, failed)
+            self._failed_items = cached
+        return cached[1], version
+    
     def update_worker_stats(self, stats: Dict[str, Any]):
         """Update worker statistics with heartbeat (Worker only)"""
         try:
@@ -125,17 +249,29 @@ class SharedDataManager:
         except Exception as e:
             print(f"Error updating worker stats: {e}")
     
+    def write_heartbeat(self, heartbeat_data: Dict[str, Any]):
+        """Write the worker's heartbeat state (Worker only, when it changes)"""
+        self._write_json_file(self.heartbeat_file, heartbeat_data)
+    
+    def touch_heartbeat(self):
+        """Mark the worker alive; the heartbeat file's mtime is the last heartbeat time (Worker only)"""
+        os.utime(self.heartbeat_file, None)
+    
     def get_worker_stats(self) -> Dict[str, Any]:
         """Get worker statistics with health check (Flask reads this)"""
         try:
             stats = self._read_json_file(self.worker_stats_file) or {}
             
             # Read separate heartbeat file for more frequent updates
-            heartbeat_file = self.worker_stats_file.replace('.json', '_heartbeat.json')
-            heartbeat_data = self._read_json_file(heartbeat_file) or {}
+            heartbeat_data = self._read_json_file(self.heartbeat_file) or {}
             
             # Merge heartbeat data into stats
             if heartbeat_data:
+                try:
+                    mtime = os.stat(self.heartbeat_file).st_mtime
+                    heartbeat_data['last_heartbeat'] = datetime.fromtimestamp(mtime).isoformat()
+                except OSError:
+                    pass
                 stats.update(heartbeat_data)
             
             # Add health check based on last heartbeat
@@ -169,35 +305,85 @@ class SharedDataManager:
     def update_no_coverart_cache(self, no_coverart_data: List[Dict[str, str]]):
         """Update no cover art cache (Worker only)"""
         try:
-            cache_data = {
-                'last_updated': datetime.now().isoformat(),
-                'albums': no_coverart_data
-            }
-            self._write_json_file(self.no_coverart_cache_file, cache_data)
+            self._publish_json_file(self.no_coverart_cache_file, 'albums', no_coverart_data)
         except Exception as e:
             print(f"Error updating no cover art cache: {e}")
     
     def get_no_coverart_cache(self) -> List[Dict[str, str]]:
         """Get no cover art data (Flask reads this)"""
+        return self.get_no_coverart_and_version()[0]
+    
+    def get_no_coverart_and_version(self):
+        """Get (no cover art albums, version), read together so an ETag built on the version matches the albums"""
         try:
-            data = self._read_json_file(self.no_coverart_cache_file)
-            return data.get('albums', []) if data else []
+            data, version = self._read_json_file_versioned(self.no_coverart_cache_file)
+            return (data.get('albums', []) if data else []), version
         except Exception as e:
             print(f"Error reading no cover art cache: {e}")
-            return []
+            return [], self.no_coverart_version()
+    
+    def remove_no_coverart(self, barcode: str):
+        """Drop a barcode from the cached no cover art list ahead of the worker's next refresh (Flask uses this)"""
+        self.get_no_coverart_cache()  # Make sure the file has been loaded
+        with self.lock:
+            cached = self._json_file_cache.get(self.no_coverart_cache_file)
+            if cached is None:
+                return
+            stamp, data = cached
+            # Swap in a new list so readers holding the old one are unaffected
+            albums = [album for album in data.get('albums', []) if album.get('Barcode') != barcode]
+            self._json_file_cache[self.no_coverart_cache_file] = (stamp, dict(data, albums=albums))
+            self._bump_json_file_version(self.no_coverart_cache_file)
     
     def is_barcode_in_catalog(self, barcode: str) -> bool:
         """Fast check if barcode exists in catalog (Flask uses this)"""
-        catalog = self.get_catalog_cache()
-        return any(item.get('Barcode') == barcode for item in catalog)
+        return barcode in self._load_catalog()['by_barcode']
     
     def get_catalog_item(self, barcode: str) -> Optional[Dict[str, Any]]:
         """Get specific catalog item by barcode (Flask uses this)"""
-        catalog = self.get_catalog_cache()
-        for item in catalog:
-            if item.get('Barcode') == barcode:
-                return item
-        return None
+        return self._load_catalog()['by_barcode'].get(barcode)
+    
+    def get_catalog_items(self, barcodes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get several catalog items by barcode with a single catalog read (Flask uses this)"""
+        by_barcode = self._load_catalog()['by_barcode']
+        return {barcode: by_barcode[barcode] for barcode in barcodes if barcode in by_barcode}
+    
+    def get_coverart_barcodes(self) -> set:
+        """Get barcodes that have a cover art image (cached until the folder changes)"""
+        cache = self._coverart_cache
+        now = time.monotonic()
+        if cache['mtime'] is not None and now - cache['checked'] < self.coverart_recheck_seconds:
+            return cache['barcodes']
+        
+        try:
+            mtime = os.stat(self.coverart_folder).st_mtime_ns
+        except OSError:
+            return set()
+        
+        cache['checked'] = now
+        if cache['mtime'] != mtime:
+            try:
+                with os.scandir(self.coverart_folder) as entries:
+                    barcodes = {entry.name[:-4] for entry in entries if entry.name.endswith('.jpg')}
+            except OSError as e:
+                print(f"Error listing cover art folder: {e}")
+                return cache['barcodes']
+            cache['barcodes'] = barcodes
+            cache['mtime'] = mtime
+            cache['version'] += 1
+        return cache['barcodes']
+    
+    def coverart_version(self) -> int:
+        """Get a counter that changes every time the cover art folder is re-scanned"""
+        return self._coverart_cache['version']
+    
+    def catalog_version(self) -> int:
+        """Get a counter that changes every time a new catalog snapshot is published"""
+        return self._load_catalog()['version']
+    
+    def invalidate_coverart_cache(self):
+        """Force the cover art listing to be re-scanned on next access"""
+        self._coverart_cache['mtime'] = None
     
     def _read_json_file(self, filepath: str) -> Optional[Dict[str, Any]]:
         """Safely read a JSON file"""
@@ -210,6 +396,44 @@ class SharedDataManager:
         except (json.JSONDecodeError, IOError):
             return None
     
+    def _read_json_file_cached(self, filepath: str) -> Optional[Dict[str, Any]]:
+        """Read a JSON file, reusing the parsed data until the file changes (callers must not mutate it)"""
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._json_file_cache.get(filepath)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        
+        data = self._read_json_file(filepath)
+        if data is not None:  # Don't remember a half-written file
+            with self.lock:
+                self._json_file_cache[filepath] = (stamp, data)
+                self._bump_json_file_version(filepath)
+        return data
+    
+    def _read_json_file_versioned(self, filepath: str):
+        """(data, version) for a JSON file, taken together under the lock that guards replacing them"""
+        self._read_json_file_cached(filepath)  # Reload first if the file has changed
+        with self.lock:
+            cached = self._json_file_cache.get(filepath)
+            return (cached[1] if cached else None), self._json_file_versions.get(filepath, 0)
+    
+    def _bump_json_file_version(self, filepath: str):
+        """Note that the cached data for a JSON file has been replaced"""
+        self._json_file_versions[filepath] = self._json_file_versions.get(filepath, 0) + 1
+    
+    def queue_status_version(self) -> int:
+        """Get a counter that changes whenever a new queue status is loaded"""
+        return self._json_file_versions.get(self.queue_status_file, 0)
+    
+    def no_coverart_version(self) -> int:
+        """Get a counter that changes whenever the no cover art list changes"""
+        return self._json_file_versions.get(self.no_coverart_cache_file, 0)
+    
     def _write_json_file(self, filepath: str, data: Dict[str, Any]):
         """Safely write a JSON file"""
         try:
@@ -218,6 +442,17 @@ class SharedDataManager:
         except IOError as e:
             print(f"Error writing {filepath}: {e}")
     
+    def _publish_json_file(self, filepath: str, key: str, value: Any):
+        """Write {'last_updated', key: value} unless value is unchanged since the last write"""
+        # Skipping identical rewrites keeps Flask's parsed copy (and the ETags built on it) valid
+        if self._last_published.get(filepath) == value and os.path.exists(filepath):
+            return
+        self._write_json_file(filepath, {
+            'last_updated': datetime.now().isoformat(),
+            key: value
+        })
+        self._last_published[filepath] = value
+    
     def get_current_timestamp(self) -> str:
         """Get current timestamp in ISO format"""
         return datetime.now().isoformat()
@@ -292,5 +527,58 @@ class SharedDataManager:
         except Exception as e:
             print(f"Error forcing catalog refresh: {e}")
 
+# Held by everything in this process that writes the track listings journal (Flask's appends and
+# the worker's appends and compaction), so a compaction can't replace the file under an append
+tracks_journal_lock = threading.RLock()
+
+def read_json_lines(path: str, loads=json.loads, offset: int = 0) -> Dict[str, Any]:
+    """
+    Read a file of JSON objects, one per line, merged in order (later lines win).
+    A file holding a single JSON object, even an indented one, reads as that object.
+    With offset, only the lines appended after that many bytes are read.
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    
+    merged = {}
+    try:
+        for line in data.splitlines():
+            if line.strip():
+                merged.update(loads(line))
+        return merged
+    except ValueError:
+        pass
+    
+    # Not one object per line (e.g. an indented file from before the journal format, maybe
+    # with lines appended since), so decode the objects one after another
+    text = data.decode('utf-8')
+    decoder = json.JSONDecoder()
+    merged = {}
+    pos = 0
+    while True:
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos >= len(text):
+            return merged
+        try:
+            obj, pos = decoder.raw_decode(text, pos)
+        except ValueError:
+            if not merged:
+                raise
+            # A torn last write; keep everything before it
+            print(f"Ignoring unreadable data at the end of {path}")
+            return merged
+        merged.update(obj)
+
+def append_json_line(path: str, data: Dict[str, Any], dumps=None):
+    """Append a JSON object to a file read by read_json_lines, as one write"""
+    line = dumps(data) if dumps else json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    if isinstance(line, str):
+        line = line.encode('utf-8')
+    # Each record starts with a newline, so it never runs onto a last line written without one
+    with open(path, 'ab') as f:
+        f.write(b'\n' + line)
+
 # Global instance
 shared_data = SharedDataManager()
\ No newline at end of file
@@ -40,9 +40,6 @@ function AlbumDetail() {
   }, [barcode])
 
 
-  // Get cover art URL with fallback
-  const getCoverUrl = (barcode) => `/static/coverart/${barcode}.jpg`
-
   // Check if track is starred
   const isTrackStarred = (trackNumber) => {
     const albumTracks = starredTracks[barcode] || []
@@ -124,15 +121,17 @@ function AlbumDetail() {
         {/* Left Side - Album Cover */}
         <div className="album-cover-section">
           <div className="album-cover-container">
-            <img 
-              src={getCoverUrl(barcode)}
-              alt={`${albumData.Artist} - ${albumData['Album/Release']}`}
-              onError={(e) => {
-                e.target.style.display = 'none'
-                e.target.nextSibling.style.display = 'flex'
-              }}
-            />
-            <div className="album-cover-placeholder" style={{ display: 'none' }}>
+            {album.cover_url && (
+              <img 
+                src={album.cover_url}
+                alt={`${albumData.Artist} - ${albumData['Album/Release']}`}
+                onError={(e) => {
+                  e.target.style.display = 'none'
+                  e.target.nextSibling.style.display = 'flex'
+                }}
+              />
+            )}
+            <div className="album-cover-placeholder" style={{ display: album.cover_url ? 'none' : 'flex' }}>
               No Cover Art
             </div>
             
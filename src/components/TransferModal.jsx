@@ -14,36 +14,44 @@ function TransferModal({ isOpen, onClose }) {
 
   // Handle Spotify authentication on mount
   useEffect(() => {
-    // Check for Spotify auth data in URL
+    // Check for a Spotify auth handle in URL
     const urlParams = new URLSearchParams(window.location.search)
-    const spotifyAuthData = urlParams.get('spotify_auth')
+    const spotifyAuthHandle = urlParams.get('spotify_auth_handle')
     
-    if (spotifyAuthData && currentUser) {
-      try {
-        const authData = JSON.parse(spotifyAuthData)
-        
-        // Update current user with Spotify auth data
-        const updatedData = {
-          ...currentUserData,
-          spotifyAuth: authData
-        }
-        
-        storageService.updateUserData(currentUser, updatedData)
-        refreshUserData()
-        
-        // Clean up URL
-        window.history.replaceState({}, document.title, window.location.pathname)
-        
-        // Force a small delay to ensure userData context has updated before showing success
-        setTimeout(() => {
-          showMessage('Spotify account connected successfully!')
-          setActiveTab('spotify')
-        }, 100)
-        
-      } catch (error) {
-        console.error('Error processing Spotify auth:', error)
-        showMessage('Error connecting Spotify account', 'error')
-      }
+    if (spotifyAuthHandle && currentUser) {
+      // Clean up URL straight away - the handle can only be redeemed once
+      window.history.replaceState({}, document.title, window.location.pathname)
+      
+      apiService.consumeSpotifyAuth(spotifyAuthHandle)
+        .then(authData => {
+          // Update current user with Spotify auth data
+          storageService.updateUserData(currentUser, { spotifyAuth: authData })
+          refreshUserData()
+          
+          // Force a small delay to ensure userData context has updated before showing success
+          setTimeout(() => {
+            showMessage('Spotify account connected successfully!')
+            setActiveTab('spotify')
+          }, 100)
+          
+          // The callback does not wait on the profile lookup, so fetch it now
+          if (!authData.user_id) {
+            return apiService.getSpotifyProfile(authData.access_token)
+              .then(profile => {
+                const latest = storageService.getUserDataForUser(currentUser)
+                if (latest?.spotifyAuth?.access_token !== authData.access_token) return
+                storageService.updateUserData(currentUser, {
+                  spotifyAuth: { ...latest.spotifyAuth, ...profile }
+                })
+                refreshUserData()
+              })
+              .catch(error => console.error('Error fetching Spotify profile:', error))
+          }
+        })
+        .catch(error => {
+          console.error('Error processing Spotify auth:', error)
+          showMessage('Error connecting Spotify account', 'error')
+        })
     }
     
     // Check for Spotify error
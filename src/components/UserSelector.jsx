@@ -20,7 +20,7 @@ function UserSelector() {
   // Check for Spotify auth callback and auto-open modal
   useEffect(() => {
     const urlParams = new URLSearchParams(window.location.search)
-    if (urlParams.get('spotify_auth') || urlParams.get('spotify_error')) {
+    if (urlParams.get('spotify_auth_handle') || urlParams.get('spotify_error')) {
       setShowTransferModal(true)
     }
   }, [])
@@ -59,6 +59,18 @@ class ApiService {
     return await this.request(API_ENDPOINTS.starredTracksBackup(syncId))
   }
 
+  async getSpotifyProfile(accessToken) {
+    return await this.request(API_ENDPOINTS.spotifyProfile, {
+      headers: { 'Authorization': `Bearer ${accessToken}` }
+    })
+  }
+
+  async consumeSpotifyAuth(handle) {
+    return await this.request(API_ENDPOINTS.spotifyConsume(handle), {
+      method: 'POST'
+    })
+  }
+
   async refreshCatalog() {
     return await this.request(API_ENDPOINTS.catalogRefresh, {
       method: 'POST'
@@ -8,7 +8,9 @@ export const API_ENDPOINTS = {
   starredAlbumsBackup: (syncId) => `${API_BASE}/starred-albums/${syncId}`,
   starredTracks: `${API_BASE}/starred-tracks`, 
   starredTracksBackup: (syncId) => `${API_BASE}/starred-tracks/${syncId}`,
-  catalogRefresh: `${API_BASE}/catalog/refresh`
+  catalogRefresh: `${API_BASE}/catalog/refresh`,
+  spotifyProfile: '/spotify/me',
+  spotifyConsume: (handle) => `/spotify/consume/${handle}`
 }
 
 // Local storage keys
@@ -0,0 +1,12 @@
+"""
+Tests for the catalog app. The modules create their data files (queue database, caches,
+shared_data/) relative to the working directory, so the tests run from a scratch directory.
+"""
+
+import os
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(tempfile.mkdtemp(prefix='mb_album_tests_'))
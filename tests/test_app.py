@@ -0,0 +1,91 @@
+import os
+import unittest
+
+import app
+
+
+def clear_starred():
+    """Start from no starred tracks or albums"""
+    app.flush_starred_writes()
+    for path in (app.STARRED_FILE, app.STARRED_ALBUMS_FILE):
+        if os.path.exists(path):
+            os.remove(path)
+    app._STARRED_TRACKS_CACHE['data'] = None
+    app._STARRED_ALBUMS_CACHE['data'] = None
+
+
+class StarredJournalTest(unittest.TestCase):
+    """Star/unstar rows appended to starred.csv and its compaction back to a snapshot"""
+    
+    def setUp(self):
+        clear_starred()
+    
+    def _reload(self):
+        # Drop the in-memory copies so the next load reads the files
+        app.flush_starred_writes()
+        app._STARRED_TRACKS_CACHE['data'] = None
+        app._STARRED_ALBUMS_CACHE['data'] = None
+    
+    def _starred_rows(self):
+        with open(app.STARRED_FILE, encoding='utf-8') as f:
+            return f.read().splitlines()[1:]
+    
+    def test_journal_round_trip_and_compaction(self):
+        app.star_track('111', 1)
+        app.star_track('111', 2)
+        app.unstar_track('111', 1)
+        app.star_track('222', 5)
+        app.star_album('111')
+        app.star_album('222')
+        app.unstar_album('222')
+        self._reload()
+        
+        expected_tracks = {'111': {'2'}, '222': {'5'}}
+        self.assertEqual(app.load_starred_tracks(), expected_tracks)
+        self.assertEqual(app.load_starred_albums(), {'111'})
+        self.assertTrue(any(row.endswith(',-') for row in self._starred_rows()))
+        
+        app.compact_starred()
+        self.assertEqual(sorted(self._starred_rows()), ['111,2', '222,5'])
+        self._reload()
+        self.assertEqual(app.load_starred_tracks(), expected_tracks)
+        self.assertEqual(app.load_starred_albums(), {'111'})
+    
+    def test_star_does_not_change_a_dict_being_read(self):
+        app.star_track('333', 1)
+        before = app.load_starred_tracks()
+        tracks = before['333']
+        app.star_track('333', 2)
+        app.unstar_track('333', 1)
+        self.assertEqual(tracks, {'1'})
+        self.assertEqual(app.load_starred_tracks()['333'], {'2'})
+
+
+class ETagTest(unittest.TestCase):
+    
+    def setUp(self):
+        clear_starred()
+        self.client = app.app.test_client()
+    
+    def test_if_none_match_gets_304_until_the_data_changes(self):
+        response = self.client.get('/admin/catalog')
+        etag = response.headers['ETag'].strip('"')
+        self.assertEqual(response.status_code, 200)
+        
+        response = self.client.get('/admin/catalog', headers={'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 304)
+        # flask-compress tags compressed responses as "<etag>:<encoding>"
+        response = self.client.get('/admin/catalog', headers={'If-None-Match': f'"{etag}:gzip"'})
+        self.assertEqual(response.status_code, 304)
+        
+        app.star_album('444')
+        response = self.client.get('/admin/catalog', headers={'If-None-Match': f'"{etag}"'})
+        self.assertEqual(response.status_code, 200)
+    
+    def test_make_etag_depends_on_every_part(self):
+        self.assertEqual(app.make_etag('a', 1), app.make_etag('a', 1))
+        self.assertNotEqual(app.make_etag('a', 1), app.make_etag('a', 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import json
+import os
+import tempfile
+import unittest
+
+from shared_data import read_json_lines, append_json_line
+
+
+class JsonLinesTest(unittest.TestCase):
+    """The JSON lines journal behind barcode_tracks.json"""
+    
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'journal.json')
+    
+    def test_appended_lines_merge_with_later_lines_winning(self):
+        append_json_line(self.path, {'111': ['a'], '222': ['b']})
+        append_json_line(self.path, {'111': ['c']})
+        self.assertEqual(read_json_lines(self.path), {'111': ['c'], '222': ['b']})
+    
+    def test_legacy_indented_file_with_lines_appended(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'111': ['a', 'b']}, f, indent=2)
+        append_json_line(self.path, {'222': ['x']})
+        self.assertEqual(read_json_lines(self.path), {'111': ['a', 'b'], '222': ['x']})
+    
+    def test_torn_last_write_is_ignored(self):
+        append_json_line(self.path, {'111': ['a']})
+        with open(self.path, 'ab') as f:
+            f.write(b'\n{"222": ["x"')
+        self.assertEqual(read_json_lines(self.path), {'111': ['a']})
+    
+    def test_offset_reads_only_later_lines(self):
+        append_json_line(self.path, {'111': ['a']})
+        size = os.path.getsize(self.path)
+        append_json_line(self.path, {'222': ['x']})
+        self.assertEqual(read_json_lines(self.path, offset=size), {'222': ['x']})
+
+
+if __name__ == '__main__':
+    unittest.main()
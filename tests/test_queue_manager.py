@@ -0,0 +1,44 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from queue_manager import QueueManager
+
+
+class QueueManagerTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.qm = QueueManager(os.path.join(tempfile.mkdtemp(), 'queue.db'))
+    
+    def _row(self, barcode):
+        conn = sqlite3.connect(self.qm.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            return dict(conn.execute('SELECT * FROM barcode_queue WHERE barcode = ?', (barcode,)).fetchone())
+        finally:
+            conn.close()
+    
+    def test_add_barcodes_reports_new_and_existing(self):
+        self.qm.add_barcode('111')
+        results = self.qm.add_barcodes(['222', '111', '333'])
+        self.assertTrue(results['222']['success'])
+        self.assertFalse(results['111']['success'])
+        self.assertEqual(results['333']['position'], 3)
+    
+    def test_apply_updates_sets_several_fields(self):
+        self.qm.add_barcode('111')
+        self.qm.apply_updates('111', status='complete', artist='Zed', metadata_complete=True)
+        row = self._row('111')
+        self.assertEqual((row['status'], row['artist'], row['metadata_complete']), ('complete', 'Zed', 1))
+    
+    def test_apply_updates_rejects_unknown_fields(self):
+        self.qm.add_barcode('111')
+        with self.assertRaises(ValueError):
+            self.qm.apply_updates('111', status='complete', created_at='2000-01-01')
+        # Nothing is written when any field is invalid
+        self.assertEqual(self._row('111')['status'], 'pending')
+
+
+if __name__ == '__main__':
+    unittest.main()
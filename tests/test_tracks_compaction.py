@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import background_worker
+from background_worker import BackgroundWorker
+from shared_data import read_json_lines, append_json_line
+
+
+class TracksCompactionTest(unittest.TestCase):
+    """The worker's appends to the tracks journal and its compaction"""
+    
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'barcode_tracks.json')
+        self.worker = BackgroundWorker(tracks_cache_file=self.path)
+        self.worker._load_tracks_cache()
+    
+    def _lines(self):
+        with open(self.path, 'rb') as f:
+            return [line for line in f if line.strip()]
+    
+    def test_compaction_keeps_every_listing(self):
+        with mock.patch.object(background_worker, 'TRACKS_COMPACT_LINES', 3):
+            self.worker._save_tracks_entry('111', ['a'])
+            # Appended by Flask between the worker's own writes
+            append_json_line(self.path, {'222': ['b']})
+            self.worker._save_tracks_entry('333', ['c'])
+            self.worker._save_tracks_entry('111', ['d'])
+        
+        self.assertEqual(len(self._lines()), 1)
+        expected = {'111': ['d'], '222': ['b'], '333': ['c']}
+        self.assertEqual(read_json_lines(self.path), expected)
+        self.assertEqual(self.worker._load_tracks_cache(), expected)
+    
+    def test_appends_after_compaction_are_read_back(self):
+        self.worker._save_tracks_entry('111', ['a'])
+        self.worker._compact_tracks_cache()
+        self.worker._save_tracks_entry('222', ['b'])
+        self.assertEqual(read_json_lines(self.path), {'111': ['a'], '222': ['b']})
+
+
+if __name__ == '__main__':
+    unittest.main()